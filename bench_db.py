@@ -0,0 +1,131 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+from stock_scraper.db_replica import remote_engine, replica_engine, sync
+from stock_scraper.db_writer import TABLE, fetch_hashes, write_result
+
+# ---------------------------------------------------------
+# [벤치마크] DB 쓰기 경로: 원격 Turso 직접 vs 임베디드 레플리카 (+ 로컬 SQLite 기준선)
+# - 가짜 결과 N행을 --days일치 쓰고 (처음은 전부 신규, 이후 --change 비율만 변경) 단계별 시간 측정
+# - 대시보드형 읽기(한 날짜 전체 / 한 종목 기간 조회)도 같은 엔진으로 잰다
+# - remote / replica는 TURSO_DB_URL, TURSO_AUTH_TOKEN 필요 (벤치 전용 DB를 쓸 것, --table로 분리)
+# - replica는 아직 수집 경로에 없는 실험 모드 (실제 Turso에서 쓰기/sync 동작을 확인하는 용도, 기본 제외)
+# 사용법: python bench_db.py --modes local,remote,replica --rows 2700 --days 3
+# ---------------------------------------------------------
+
+
+def fake_result(rows, date, seed):
+    rng = np.random.default_rng(seed)
+    symbols = [f"{i:06d}" for i in range(rows)]
+    price = rng.integers(1000, 500000, rows)
+    return pd.DataFrame({
+        "날짜": date, "Symbol": symbols, "종목명": [f"종목{i}" for i in range(rows)],
+        "구분": rng.choice(["KOSPI", "KOSDAQ"], rows), "업종명": "",
+        "시가": price, "고가": price, "저가": price, "현재가": price, "전일비": 0, "등락률": 0.0,
+        "거래량": rng.integers(0, 10 ** 7, rows), "전일거래량": 0, "거래량비율": 0.0,
+        "시가총액": rng.integers(100, 10 ** 5, rows), "상장주식수": rng.integers(10 ** 6, 10 ** 9, rows),
+        "외국인순매수": rng.integers(-10 ** 5, 10 ** 5, rows), "기관순매수": 0, "개인순매수": 0,
+        "신용잔고율": 0.0,
+    })
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return round(time.perf_counter() - start, 3)
+
+
+def make_engine(mode, workdir):
+    if mode == "local":
+        return create_engine(f"sqlite:///{os.path.join(workdir, 'bench_local.db')}")
+    raw_url = os.environ.get("TURSO_DB_URL", "").strip()
+    token = os.environ.get("TURSO_AUTH_TOKEN", "").strip()
+    if not raw_url or not token:
+        return None
+    if mode == "remote":
+        return remote_engine(raw_url, token)
+    return replica_engine(os.path.join(workdir, "bench_replica.db"), raw_url, token)
+
+
+def run_mode(mode, args, workdir):
+    engine = make_engine(mode, workdir)
+    if engine is None:
+        print(f"⏭️ {mode}: TURSO_DB_URL / TURSO_AUTH_TOKEN 없음, 건너뜀", flush=True)
+        return None
+    result = {"mode": mode, "days": []}
+    if mode == "replica":
+        result["sync_pull_sec"] = timed(lambda: sync(engine))
+
+    base = fake_result(args.rows, "", seed=0)
+    for day in range(args.days):
+        date = f"2099{day + 1:04d}"
+        df = base.assign(날짜=date)
+        for write_mode in ("full", "diff"):
+            if write_mode == "diff":
+                # 장중 재실행처럼 일부 종목 값만 바뀜
+                changed = df.sample(frac=args.change, random_state=day).index
+                df.loc[changed, "현재가"] += 1
+            entry = {"date": date, "write_mode": write_mode}
+            entry["write_sec"] = timed(lambda: write_result(engine, df, table=args.table,
+                                                            batch_size=args.batch_size, mode=write_mode))
+            if mode == "replica":
+                entry["sync_sec"] = timed(lambda: sync(engine))
+            result["days"].append(entry)
+
+    with engine.connect() as conn:
+        last = f"2099{args.days:04d}"
+        result["read_day_sec"] = timed(lambda: fetch_hashes(conn, last, args.table))
+        result["read_symbol_sec"] = timed(lambda: conn.exec_driver_sql(
+            f'SELECT 날짜, 현재가, 거래량 FROM "{args.table}" WHERE Symbol = ? ORDER BY 날짜', ("000000",)
+        ).fetchall())
+        conn.exec_driver_sql(f'DELETE FROM "{args.table}" WHERE 날짜 LIKE ?', ("2099%",))
+        conn.commit()
+    engine.dispose()
+    return result
+
+
+def print_table(results):
+    header = f"{'mode':>8} {'date':>9} {'write':>6} {'sec':>7} {'sync':>6}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        for d in r["days"]:
+            sync_sec = d.get("sync_sec")
+            print(f"{r['mode']:>8} {d['date']:>9} {d['write_mode']:>6} {d['write_sec']:>7.3f} "
+                  f"{format(sync_sec, '>6.3f') if sync_sec is not None else '-':>6}")
+        print(f"{r['mode']:>8} 읽기: 하루치 {r['read_day_sec']:.3f}초 / 종목 이력 {r['read_symbol_sec']:.3f}초"
+              + (f" / 최초 sync {r['sync_pull_sec']:.3f}초" if "sync_pull_sec" in r else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DB 쓰기 경로 벤치마크 (원격 vs 레플리카)")
+    parser.add_argument("--modes", default="local,remote")
+    parser.add_argument("--rows", type=int, default=2700)
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--change", type=float, default=0.1, help="diff 쓰기 때 값이 바뀌는 종목 비율")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--table", default=TABLE + "_bench", help="벤치용 테이블 (운영 테이블과 분리)")
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_db_")
+    results = []
+    for mode in args.modes.split(","):
+        print(f"▶️ {mode} ...", flush=True)
+        r = run_mode(mode, args, workdir)
+        if r:
+            results.append(r)
+
+    print()
+    print_table(results)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n📝 결과 저장: {args.out}")
@@ -0,0 +1,61 @@
+import glob
+import os
+import time
+from io import StringIO
+
+import pandas as pd
+
+from stock_scraper.naver_parser import parse_supply_row
+
+# ---------------------------------------------------------
+# [벤치마크] pd.read_html vs naver_parser (frgn.naver 저장본 기준)
+# 사용법: python bench_parser.py [반복횟수]
+# ---------------------------------------------------------
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "naver")
+TARGET_DATES = ["2026.03.30", "2026.03.27", "2026.03.20"]
+
+
+def parse_read_html(html, today_str):
+    # daily_scrap.py 기존 방식 그대로
+    dfs = pd.read_html(StringIO(html), attrs={"class": "type2"}, flavor='lxml')
+    if len(dfs) > 1:
+        df = dfs[1].dropna(subset=[('날짜', '날짜')])
+        row = df[df[('날짜', '날짜')] == today_str]
+        if not row.empty:
+            return int(row[('외국인', '순매매량')].values[0]), int(row[('기관', '순매매량')].values[0])
+    return None
+
+
+def bench(name, func, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            for date in TARGET_DATES:
+                func(html, date)
+    elapsed = time.perf_counter() - start
+    calls = repeat * len(pages) * len(TARGET_DATES)
+    print(f"   {name:<10} {elapsed:8.3f}s  ({elapsed / calls * 1000:.3f} ms/page)")
+    return elapsed
+
+
+if __name__ == "__main__":
+    import sys
+
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, "frgn_*.html")))
+    pages = [open(p, encoding="euc-kr").read() for p in paths]
+
+    # 1. 두 파서 결과가 같은지 먼저 확인
+    for path, html in zip(paths, pages):
+        for date in TARGET_DATES:
+            old, new = parse_read_html(html, date), parse_supply_row(html, date)
+            if old != new:
+                print(f"❌ 결과 불일치: {os.path.basename(path)} {date} read_html={old} lxml={new}")
+                sys.exit(1)
+    print(f"✅ 결과 일치 확인: 페이지 {len(pages)}개 × 날짜 {len(TARGET_DATES)}개")
+
+    # 2. 속도 비교
+    print(f"⏱️ 반복 {repeat}회")
+    t_old = bench("read_html", parse_read_html, pages, repeat)
+    t_new = bench("lxml", parse_supply_row, pages, repeat)
+    print(f"🚀 {t_old / t_new:.1f}배 빠름")
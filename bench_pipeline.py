@@ -0,0 +1,116 @@
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_server import StandInServer
+
+# ---------------------------------------------------------
+# [벤치마크] 오프라인 전체 파이프라인 (daily_scrap.py)
+# - 네이버/KRX 리스트: bench_server 로컬 대역 서버 (지연/에러 주입)
+# - DB: 로컬 SQLite 파일 (LOCAL_DB_URL)
+# - 종목 수 1× / 5× / 20× 규모로 돌려서 처리량과 단계별 시간을 비교
+# 사용법: python bench_pipeline.py --scales 1,5,20 --engines async,thread
+# ---------------------------------------------------------
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_once(server, n_codes, engine, date, extra_args, workdir):
+    env = dict(os.environ)
+    env.update({
+        "NAVER_BASE_URL": server.base_url,
+        "LISTING_URL": f"{server.base_url}/listing.csv?n={n_codes}",
+        "LOCAL_DB_URL": f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        "TURSO_DB_URL": "",
+        "TURSO_AUTH_TOKEN": "",
+    })
+    report_path = os.path.join(workdir, "run_report.json")
+    cmd = [sys.executable, os.path.join(HERE, "daily_scrap.py"),
+           "--date", date, "--engine", engine, "--supply-source", "naver",
+           "--checkpoint", os.path.join(workdir, "checkpoint.db"),
+           "--report", report_path] + extra_args
+
+    start = time.perf_counter()
+    with open(os.path.join(workdir, "run.log"), "w", encoding="utf-8") as log:
+        proc = subprocess.run(cmd, env=env, stdout=log, stderr=subprocess.STDOUT, cwd=workdir)
+    total = time.perf_counter() - start
+
+    with open(report_path, encoding="utf-8") as f:
+        report = json.load(f)
+    stages = {name: info["wall_sec"] for name, info in report.get("stages", {}).items()}
+    naver = report.get("requests", {}).get("naver", {})
+    scrape = stages.get("scrape") or 0
+    db = report.get("db_write", {})
+    return {
+        "codes": n_codes,
+        "engine": engine,
+        "exit_code": proc.returncode,
+        "total_sec": round(total, 2),
+        "stages": stages,
+        "requests": naver.get("count", 0),
+        "req_per_sec": round(naver.get("count", 0) / scrape, 1) if scrape else None,
+        "p50": naver.get("p50"),
+        "p95": naver.get("p95"),
+        "p99": naver.get("p99"),
+        "rows_per_sec": db.get("rows_per_sec"),
+        "log": os.path.join(workdir, "run.log"),
+    }
+
+
+def print_table(results):
+    header = f"{'codes':>7} {'engine':>7} {'total':>7} {'listing':>8} {'scrape':>7} {'merge':>6} " \
+             f"{'db':>6} {'req/s':>7} {'p50':>6} {'p95':>6} {'p99':>6} {'rows/s':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        s = r["stages"]
+        fmt = lambda v, spec: format(v, spec) if v is not None else "-"
+        print(f"{r['codes']:>7} {r['engine']:>7} {r['total_sec']:>7.1f} {fmt(s.get('listing'), '>8.2f')} "
+              f"{fmt(s.get('scrape'), '>7.2f')} {fmt(s.get('merge'), '>6.2f')} {fmt(s.get('db_write'), '>6.2f')} "
+              f"{fmt(r['req_per_sec'], '>7.1f')} {fmt(r['p50'], '>6.3f')} {fmt(r['p95'], '>6.3f')} "
+              f"{fmt(r['p99'], '>6.3f')} {fmt(r['rows_per_sec'], '>8.0f')}"
+              + ("" if r["exit_code"] == 0 else f"  ❌ exit {r['exit_code']} ({r['log']})"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="오프라인 파이프라인 벤치마크")
+    parser.add_argument("--scales", default="1,5,20", help="기준 종목 수 대비 배수 목록")
+    parser.add_argument("--base", type=int, default=2700, help="1× 종목 수")
+    parser.add_argument("--engines", default="async,thread")
+    parser.add_argument("--date", default="20260330")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="느린 응답 비율 (꼬리 지연)")
+    parser.add_argument("--slow-ms", type=float, default=3000)
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    args, extra = parser.parse_known_args()
+
+    date = datetime.datetime.strptime(args.date, "%Y%m%d").date()
+    server = StandInServer(date, args.port, args.latency_ms, args.jitter_ms, args.error_rate,
+                           args.throttle_rate, args.missing_rate,
+                           slow_rate=args.slow_rate, slow_ms=args.slow_ms).start()
+    print(f"🧪 대역 서버: {server.base_url} (지연 {args.latency_ms}±{args.jitter_ms}ms, "
+          f"에러 {args.error_rate:.0%}, 429 {args.throttle_rate:.0%})", flush=True)
+
+    results = []
+    for scale in [int(s) for s in args.scales.split(",")]:
+        for engine in args.engines.split(","):
+            n_codes = args.base * scale
+            workdir = tempfile.mkdtemp(prefix=f"bench_{scale}x_{engine}_")
+            print(f"▶️ {scale}× ({n_codes}종목) / {engine} ...", flush=True)
+            results.append(run_once(server, n_codes, engine, args.date, extra, workdir))
+
+    print()
+    print_table(results)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n📝 결과 저장: {args.out}")
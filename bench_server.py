@@ -0,0 +1,209 @@
+import asyncio
+import datetime
+import gzip
+import random
+import threading
+import zlib
+
+from aiohttp import web
+
+# ---------------------------------------------------------
+# [벤치마크] 네이버 금융 / KRX 종목 리스트 로컬 대역 서버
+# - /item/frgn.naver?code=XXXXXX[&page=N] : frgn.naver 구조를 흉내 낸 합성 페이지
+# - /listing.csv?n=2700                     : FDR StockListing('KRX') 컬럼 구조의 CSV
+# - 지연(latency/jitter)과 에러(503/429) 비율, 느린 응답(slow_rate/slow_ms)을 설정해서 주입
+# 단독 실행: python bench_server.py --port 8800 --date 20260330
+# ---------------------------------------------------------
+ROWS_PER_PAGE = 20
+MARKETS = ["KOSPI"] * 35 + ["KOSDAQ"] * 60 + ["KONEX"] * 5
+
+
+def _rng(code, salt=0):
+    return random.Random(zlib.crc32(f"{code}:{salt}".encode()))
+
+
+def _trading_days(end, n, skip=0):
+    days, d = [], end
+    while len(days) < n + skip:
+        if d.weekday() < 5:
+            days.append(d)
+        d -= datetime.timedelta(days=1)
+    return days[skip:]
+
+
+def _signed(v):
+    return f"+{v:,}" if v > 0 else f"{v:,}"
+
+
+def render_frgn_page(code, date, page=1, has_today=True):
+    rng = _rng(code, page)
+    skip = (page - 1) * ROWS_PER_PAGE + (0 if has_today else 1)
+    rows = []
+    for i, d in enumerate(_trading_days(date, ROWS_PER_PAGE, skip)):
+        close = rng.randint(1000, 300000)
+        chg = rng.randint(-3000, 3000)
+        rows.append(
+            '<tr onMouseOver="mouseOver(this)" onMouseOut="mouseOut(this)">\n'
+            f'<td class="tc"><span class="tah p10 gray03">{d:%Y.%m.%d}</span></td>\n'
+            f'<td class="num"><span class="tah p11">{close:,}</span></td>\n'
+            f'<td class="num"><img src="https://ssl.pstatic.net/imgstock/images/images4/ico_up.gif" alt="상승">'
+            f'<span class="tah p11 red02">{abs(chg):,}</span></td>\n'
+            f'<td class="num"><span class="tah p11 red01">{chg / close * 100:+.2f}%</span></td>\n'
+            f'<td class="num"><span class="tah p11">{rng.randint(0, 20000000):,}</span></td>\n'
+            f'<td class="num"><span class="tah p11 red01">{_signed(rng.randint(-2000000, 2000000))}</span></td>\n'
+            f'<td class="num"><span class="tah p11 nv01">{_signed(rng.randint(-3000000, 3000000))}</span></td>\n'
+            f'<td class="num"><span class="tah p11">{rng.randint(0, 3000000000):,}</span></td>\n'
+            f'<td class="num"><span class="tah p11">{rng.uniform(0, 60):.2f}%</span></td>\n'
+            '</tr>'
+        )
+        if i % 5 == 4:
+            rows.append('<tr><td colspan="9" class="division_line"></td></tr>')
+    nav = "\n".join(f'<li><a href="/sise/sise_group.naver?type=upjong&no={i}">업종{i}</a></li>' for i in range(60))
+    brokers = "\n".join(
+        f'<tr><td class="title">증권{i}</td><td class="num">{rng.randint(1000, 900000):,}</td>'
+        f'<td class="title">증권{9 - i}</td><td class="num">{rng.randint(1000, 900000):,}</td></tr>'
+        for i in range(5)
+    )
+    return f'''<!DOCTYPE html>
+<html lang="ko">
+<head><meta http-equiv="Content-Type" content="text/html; charset=euc-kr"><title>{code} : 네이버페이 증권</title></head>
+<body>
+<div id="wrap">
+<div id="header"><ul class="lnb">
+{nav}
+</ul></div>
+<div id="middle" class="new_totalinfo">
+<table summary="거래원정보" class="type2">
+<tr><th scope="col">매도상위</th><th scope="col">거래량</th><th scope="col">매수상위</th><th scope="col">거래량</th></tr>
+{brokers}
+</table>
+<table summary="외국인 기관 순매매 거래량에 관한표이며 날짜별로 정보를 제공합니다." class="type2">
+<caption>외국인 기관 순매매 거래량</caption>
+<tr>
+<th rowspan="2" scope="col">날짜</th><th rowspan="2" scope="col">종가</th><th rowspan="2" scope="col">전일비</th>
+<th rowspan="2" scope="col">등락률</th><th rowspan="2" scope="col">거래량</th>
+<th scope="col">기관</th><th colspan="3" scope="col">외국인</th>
+</tr>
+<tr><th scope="col">순매매량</th><th scope="col">순매매량</th><th scope="col">보유주수</th><th scope="col">보유율</th></tr>
+<tr><td colspan="9" height="8"></td></tr>
+{chr(10).join(rows)}
+</table>
+</div>
+<div id="footer"><p>네이버페이 증권에서 제공하는 투자 정보는 참고용입니다.</p></div>
+</div>
+</body>
+</html>
+'''
+
+
+def render_listing(n):
+    lines = ["Code,ISU_CD,Name,Market,Dept,Close,ChangeCode,Changes,ChagesRatio,"
+             "Open,High,Low,Volume,Amount,Marcap,Stocks,MarketId"]
+    for i in range(n):
+        code = f"{(i * 7 + 20) % 1000000:06d}"
+        rng = _rng(code)
+        market = MARKETS[i % len(MARKETS)]
+        name = f"종목{i}" + ("스팩" if i % 50 == 7 else "")
+        close = rng.randint(1000, 300000)
+        chg = rng.randint(-3000, 3000)
+        stocks = rng.randint(1000000, 500000000)
+        volume = 0 if i % 97 == 13 else rng.randint(1000, 20000000)
+        lines.append(
+            f"{code},KR7{code}003,{name},{market},,{close},1,{chg},{chg / close * 100:.2f},"
+            f"{close - 100},{close + 200},{close - 300},{volume},{volume * close},"
+            f"{close * stocks},{stocks},STK"
+        )
+    return "\n".join(lines) + "\n"
+
+
+class StandInServer:
+    """네이버/KRX 대역 서버. start()로 백그라운드 스레드에서 띄운다."""
+
+    def __init__(self, date, port=8800, latency_ms=20, jitter_ms=10, error_rate=0.0,
+                 throttle_rate=0.0, missing_rate=0.05, seed=0, slow_rate=0.0, slow_ms=3000):
+        self.date = date
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.missing_rate = missing_rate
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.rng = random.Random(seed)
+        self.hits = 0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    async def frgn(self, request):
+        self.hits += 1
+        delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+        if self.rng.random() < self.slow_rate:
+            delay += self.slow_ms / 1000
+        await asyncio.sleep(delay)
+        roll = self.rng.random()
+        if roll < self.error_rate:
+            return web.Response(status=503)
+        if roll < self.error_rate + self.throttle_rate:
+            return web.Response(status=429)
+        code = request.query.get("code", "")
+        page = int(request.query.get("page", 1))
+        has_today = _rng(code, "today").random() >= self.missing_rate
+        body = render_frgn_page(code, self.date, page, has_today).encode("euc-kr", errors="replace")
+        headers = {}
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            # 네이버처럼 gzip + Content-Length
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        return web.Response(body=body, content_type="text/html", charset="euc-kr", headers=headers)
+
+    async def listing(self, request):
+        return web.Response(text=render_listing(int(request.query.get("n", 2700))), content_type="text/csv")
+
+    def start(self):
+        ready = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            app = web.Application()
+            app.router.add_get("/item/frgn.naver", self.frgn)
+            app.router.add_get("/listing.csv", self.listing)
+            runner = web.AppRunner(app, access_log=None)
+            loop.run_until_complete(runner.setup())
+            loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", self.port).start())
+            ready.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        ready.wait()
+        return self
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="네이버/KRX 로컬 대역 서버")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--date", default=datetime.date.today().strftime("%Y%m%d"))
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-ms", type=float, default=3000)
+    a = parser.parse_args()
+
+    server = StandInServer(datetime.datetime.strptime(a.date, "%Y%m%d").date(), a.port, a.latency_ms,
+                           a.jitter_ms, a.error_rate, a.throttle_rate, a.missing_rate,
+                           slow_rate=a.slow_rate, slow_ms=a.slow_ms).start()
+    print(f"🧪 대역 서버 실행 중: {server.base_url} (Ctrl+C 종료)", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# ---------------------------------------------------------
+# [벤치마크] CLI 시작 시간 (python -m stock_scraper ...)
+# - 각 명령을 새 프로세스로 여러 번 띄워 실행 시간 중앙값을 재고
+#   그 명령이 무거운 모듈(pandas, FDR, pykrx, sqlalchemy, aiohttp ...)을 불러왔는지도 같이 본다.
+# - 네트워크/DB는 쓰지 않는다 (--help와 임포트만)
+# 사용법: python bench_startup.py --repeat 5 --out startup_results.json
+# ---------------------------------------------------------
+HERE = os.path.dirname(os.path.abspath(__file__))
+HEAVY = ["pandas", "FinanceDataReader", "pykrx", "sqlalchemy", "aiohttp", "requests", "pyarrow", "lxml"]
+COMMANDS = {
+    "python (기준선)": ["-c", "pass"],
+    "--help": ["-m", "stock_scraper", "--help"],
+    "scrape --help": ["-m", "stock_scraper", "scrape", "--help"],
+    "probe --help": ["-m", "stock_scraper", "probe", "--help"],
+    "import cli+probe": ["-c", "import stock_scraper.cli, stock_scraper.probe"],
+    "import job": ["-c", "import stock_scraper.job"],
+}
+# 명령 실행 뒤 어떤 무거운 모듈이 올라왔는지 출력하게 감싼다
+LOADED = ("import atexit, sys; atexit.register(lambda: print('LOADED=' + ','.join("
+          "m for m in %r if m in sys.modules), file=sys.stderr))" % (HEAVY,))
+
+
+def run_once(argv):
+    if argv[0] == "-m":
+        code = (f"{LOADED}; import runpy; sys.argv = {argv[1:]!r}; "
+                f"runpy.run_module({argv[1]!r}, run_name='__main__')")
+    else:
+        code = f"{LOADED}; {argv[1]}"
+    env = dict(os.environ, PYTHONPATH=HERE)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, cwd=HERE)
+    sec = time.perf_counter() - start
+    loaded = [line[len("LOADED="):] for line in proc.stderr.splitlines() if line.startswith("LOADED=")]
+    return sec, proc.returncode, (loaded[-1].split(",") if loaded and loaded[-1] else [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="stock_scraper CLI 시작 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5, help="명령당 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'명령':<18} {'중앙값':>8} {'최소':>8}  불러온 무거운 모듈", flush=True)
+    for name, argv in COMMANDS.items():
+        runs = [run_once(argv) for _ in range(args.repeat)]
+        secs = [r[0] for r in runs]
+        loaded = runs[-1][2]
+        results.append({"command": name, "median_sec": round(statistics.median(secs), 3),
+                        "min_sec": round(min(secs), 3), "returncode": runs[-1][1], "loaded": loaded})
+        print(f"{name:<18} {statistics.median(secs):>7.3f}s {min(secs):>7.3f}s  {', '.join(loaded) or '-'}",
+              flush=True)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"📝 결과 저장: {args.out}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
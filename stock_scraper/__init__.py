@@ -0,0 +1,9 @@
+"""KRX 전 종목 시세 + 수급 수집기.
+
+CLI: python -m stock_scraper {scrape,merge,write,backfill,reprocess,probe,daemon} ...
+무거운 의존성(pandas, FinanceDataReader, pykrx, sqlalchemy, aiohttp)은 필요한 서브커맨드에서만 불러온다.
+"""
+
+
+class JobFailed(Exception):
+    """실행을 이어갈 수 없는 실패 (CLI 종료 코드 1)."""
@@ -0,0 +1,164 @@
+import time
+
+import pandas as pd
+
+from .db_writer import TABLE, ensure_schema, upsert_rows
+
+# ---------------------------------------------------------
+# 업종/시장별 집계 테이블 (대시보드용, Npaystocks 원본 스캔 대신)
+# - 날짜 x (구분, 업종명)별 합계: 종목수, 상승/하락/보합 종목 수, 시가총액, 외국인/기관/개인 순매수
+#   업종명 = "(전체)"는 구분(시장) 전체, 구분 = 업종명 = "(전체)"는 전 종목
+# - 순매수 5일/20일 누적: 직전 거래일 누적 + 오늘 값 - 창에서 빠지는 날 값 (과거 전체 재계산 없음)
+#   직전 거래일 행이 없는 그룹만 이 테이블의 일별 값으로 다시 합산
+# - 과거 날짜를 다시 쓰면 (reprocess 등) 그 뒤 날짜들의 누적만 이 테이블 안에서 다시 계산
+# - 백필처럼 여러 날짜를 한 번에 고치면 refresh_dates: 날짜별 일별 값만 다시 쓰고 누적은 끝에 한 번 재계산
+# ---------------------------------------------------------
+AGG_TABLE = TABLE + "_sector"
+ALL = "(전체)"
+GROUP_COLS = ["구분", "업종명"]
+KEY_COLS = ["날짜"] + GROUP_COLS
+FLOW_COLS = ["외국인순매수", "기관순매수", "개인순매수"]
+WINDOWS = (5, 20)
+ROLL_COLS = [f"{col}_{w}일" for w in WINDOWS for col in FLOW_COLS]
+AGG_COLUMNS = [
+    ("날짜", "TEXT"),
+    ("구분", "TEXT"),
+    ("업종명", "TEXT"),
+    ("종목수", "INTEGER"),
+    ("상승", "INTEGER"),
+    ("하락", "INTEGER"),
+    ("보합", "INTEGER"),
+    ("시가총액", "INTEGER"),
+    *[(col, "INTEGER") for col in FLOW_COLS],
+    *[(col, "INTEGER") for col in ROLL_COLS],
+]
+
+
+def daily_rollup(result_df):
+    """result_df 하루치를 (구분, 업종명) / 구분 / 전체 단위로 합계 (벡터 groupby)."""
+    df = result_df.assign(
+        업종명=result_df["업종명"].fillna(""),
+        상승=result_df["전일비"] > 0,
+        하락=result_df["전일비"] < 0,
+        보합=result_df["전일비"] == 0,
+    )
+    spec = {"종목수": ("Symbol", "size"),
+            **{col: (col, "sum") for col in ["상승", "하락", "보합", "시가총액"] + FLOW_COLS}}
+    sector = df.groupby(GROUP_COLS, sort=False).agg(**spec).reset_index()
+    market = df.groupby("구분", sort=False).agg(**spec).reset_index().assign(업종명=ALL)
+    total = df.assign(구분=ALL, 업종명=ALL).groupby(GROUP_COLS).agg(**spec).reset_index()
+    out = pd.concat([sector, market, total], ignore_index=True)
+    out.insert(0, "날짜", result_df["날짜"].iloc[0])
+    return out
+
+
+def window_sums(daily, w):
+    """일별 값(daily: 날짜, 구분, 업종명, FLOW_COLS)으로 날짜별 w일 누적. 없는 날은 0."""
+    out = []
+    for col in FLOW_COLS:
+        wide = daily.pivot_table(index="날짜", columns=GROUP_COLS, values=col, aggfunc="sum", fill_value=0)
+        rolled = wide.sort_index().rolling(w, min_periods=1).sum()
+        out.append(rolled.stack(GROUP_COLS, future_stack=True).rename(f"{col}_{w}일"))
+    return pd.concat(out, axis=1)
+
+
+def apply_windows(today, stored, prev_dates):
+    """오늘 집계(today)에 누적 컬럼을 채운다. stored: prev_dates(최신순)의 저장된 행."""
+    keyed = today.set_index(GROUP_COLS)
+    by_date = {date: rows.set_index(GROUP_COLS) for date, rows in stored.groupby("날짜")}
+    missing = pd.Series(False, index=keyed.index)
+    for w in WINDOWS:
+        prev = by_date.get(prev_dates[0]) if prev_dates else None
+        dropped = by_date.get(prev_dates[w - 1]) if len(prev_dates) >= w else None
+        for col in FLOW_COLS:
+            name = f"{col}_{w}일"
+            total = keyed[col].astype("float64")
+            if prev is not None:
+                total = total + prev[name].reindex(keyed.index)
+                if dropped is not None:
+                    total = total - dropped[col].reindex(keyed.index).fillna(0)
+            keyed[name] = total
+            missing |= total.isna()
+
+    if missing.any():
+        # 직전 거래일 행이 없던 그룹: 이 테이블의 일별 값으로 창 전체를 합산
+        history = pd.concat([stored[KEY_COLS + FLOW_COLS], today[KEY_COLS + FLOW_COLS]], ignore_index=True)
+        date = today["날짜"].iloc[0]
+        for w in WINDOWS:
+            sums = window_sums(history, w).xs(date, level="날짜")
+            for col in FLOW_COLS:
+                name = f"{col}_{w}일"
+                keyed.loc[missing, name] = sums[name].reindex(keyed.index[missing]).values
+    out = keyed.reset_index()[today.columns.tolist() + ROLL_COLS]
+    out[ROLL_COLS] = out[ROLL_COLS].round().astype("int64")
+    return out
+
+
+def load_rows(conn, table, dates):
+    if not dates:
+        return pd.DataFrame(columns=[name for name, _ in AGG_COLUMNS])
+    marks = ", ".join("?" for _ in dates)
+    cols = [name for name, _ in AGG_COLUMNS]
+    col_sql = ", ".join(f'"{c}"' for c in cols)
+    rows = conn.exec_driver_sql(f'SELECT {col_sql} FROM "{table}" WHERE 날짜 IN ({marks})',
+                                tuple(dates)).fetchall()
+    return pd.DataFrame(rows, columns=cols)
+
+
+def rebuild_after(conn, date, table):
+    """date보다 뒤 날짜들의 누적 컬럼을 이 테이블의 일별 값으로 다시 계산. 갱신한 행 수."""
+    dates = [row[0] for row in conn.exec_driver_sql(
+        f'SELECT DISTINCT 날짜 FROM "{table}" WHERE 날짜 > ? OR 날짜 IN '
+        f'(SELECT DISTINCT 날짜 FROM "{table}" WHERE 날짜 <= ? ORDER BY 날짜 DESC LIMIT ?)',
+        (date, date, max(WINDOWS)),
+    ).fetchall()]
+    history = load_rows(conn, table, dates)
+    rolled = pd.concat([window_sums(history, w) for w in WINDOWS], axis=1).reset_index()
+    later = history[KEY_COLS].merge(rolled, on=KEY_COLS, how="left")
+    later = later[later["날짜"] > date]
+    later[ROLL_COLS] = later[ROLL_COLS].fillna(0).round().astype("int64")
+    return upsert_rows(conn, later, table, columns=AGG_COLUMNS, key_cols=KEY_COLS)
+
+
+def update_aggregates(engine, result_df, table=AGG_TABLE):
+    """result_df(하루치)의 집계를 table에 업서트. 요약 dict."""
+    start = time.perf_counter()
+    date = result_df["날짜"].iloc[0]
+    today = daily_rollup(result_df)
+    with engine.begin() as conn:
+        ensure_schema(conn, table, AGG_COLUMNS, KEY_COLS)
+        prev_dates = [row[0] for row in conn.exec_driver_sql(
+            f'SELECT DISTINCT 날짜 FROM "{table}" WHERE 날짜 < ? ORDER BY 날짜 DESC LIMIT ?',
+            (date, max(WINDOWS)),
+        ).fetchall()]
+        today = apply_windows(today, load_rows(conn, table, prev_dates), prev_dates)
+        written = upsert_rows(conn, today, table, columns=AGG_COLUMNS, key_cols=KEY_COLS)
+        rebuilt = rebuild_after(conn, date, table) if conn.exec_driver_sql(
+            f'SELECT 1 FROM "{table}" WHERE 날짜 > ? LIMIT 1', (date,)).fetchone() else 0
+    return {"groups": written, "rebuilt": rebuilt, "prev_dates": len(prev_dates),
+            "sec": round(time.perf_counter() - start, 3)}
+
+
+def refresh_dates(engine, dates, source=TABLE, table=AGG_TABLE):
+    """원본(source)에서 dates 각 날짜를 다시 읽어 일별 집계를 덮어쓰고, 가장 이른 날짜부터 누적을 재계산."""
+    start = time.perf_counter()
+    dates = sorted(set(dates))
+    written = 0
+    with engine.begin() as conn:
+        ensure_schema(conn, table, AGG_COLUMNS, KEY_COLS)
+        for date in dates:
+            rows = conn.exec_driver_sql(f'SELECT * FROM "{source}" WHERE 날짜 = ? AND Symbol IS NOT NULL', (date,))
+            day_df = pd.DataFrame(rows.fetchall(), columns=list(rows.keys()))
+            if day_df.empty:
+                continue
+            for col in ["전일비", "시가총액"] + FLOW_COLS:
+                day_df[col] = pd.to_numeric(day_df[col], errors="coerce")
+            written += upsert_rows(conn, daily_rollup(day_df).fillna(0), table,
+                                   columns=AGG_COLUMNS, key_cols=KEY_COLS)
+        rebuilt = 0
+        if written:
+            # dates[0]보다 앞선 마지막 저장 날짜 뒤로 전부 (없으면 "" → 전체)
+            row = conn.exec_driver_sql(f'SELECT MAX(날짜) FROM "{table}" WHERE 날짜 < ?', (dates[0],)).fetchone()
+            rebuilt = rebuild_after(conn, row[0] or "", table)
+    return {"dates": len(dates), "groups": written, "rebuilt": rebuilt,
+            "sec": round(time.perf_counter() - start, 3)}
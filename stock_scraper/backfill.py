@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import pandas as pd
+
+from .naver_async import fetch_text, make_session
+from .rate_control import get_controller
+from .run_report import get_report
+from .naver_parser import parse_supply_rows
+from .naver_urls import NAVER_FRGN_URL
+
+# ---------------------------------------------------------
+# 과거 수급 백필 엔진 (frgn.naver 페이지 이력)
+# - (종목 × 페이지) 단위 작업을 하나의 커넥션 풀에서 동시에 처리
+# - 페이지의 가장 오래된 날짜가 --from 보다 과거가 될 때까지만 다음 페이지 요청
+# - 페이지 하나를 한 번에 파싱해서 기간 안의 모든 날짜를 모은다
+# ---------------------------------------------------------
+PAGE_URL = NAVER_FRGN_URL + "&page={page}"
+
+
+def normalize_date(value):
+    """'20260301' / '2026.03.01' / '2026-03-01' -> 페이지 표기 '2026.03.01'."""
+    digits = "".join(ch for ch in str(value) if ch.isdigit())
+    if len(digits) != 8:
+        raise ValueError(f"날짜 형식이 잘못됐습니다: {value}")
+    return f"{digits[:4]}.{digits[4:6]}.{digits[6:]}"
+
+
+async def _backfill(codes, date_from, date_to, limiter, per_host, timeout, retries, max_pages):
+    records = []
+    stats = {"pages": 0, "failed": 0}
+    oldest_seen = {}
+
+    async with make_session(limiter.max_limit, per_host or limiter.max_limit, timeout) as session:
+        async def work(code, page):
+            html = await fetch_text(session, limiter, PAGE_URL.format(code=code, page=page), retries)
+            return code, page, html
+
+        pending = {asyncio.ensure_future(work(code, 1)) for code in codes}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                code, page, html = task.result()
+                stats["pages"] += 1
+                if stats["pages"] % 100 == 0:
+                    print(f"   👉 페이지 {stats['pages']}개 처리, 레코드 {len(records)}개", end="\r")
+                if html is None:
+                    stats["failed"] += 1
+                    continue
+                parse_start = time.perf_counter()
+                rows = parse_supply_rows(html)
+                get_report().record_parse(time.perf_counter() - parse_start)
+                if not rows:
+                    continue
+
+                oldest = rows[-1][0]
+                # 마지막 페이지를 넘기면 네이버가 같은 페이지를 다시 주므로 진행이 없으면 종료
+                if code in oldest_seen and oldest >= oldest_seen[code]:
+                    continue
+                oldest_seen[code] = oldest
+
+                for date, foreign, agency in rows:
+                    if date_from <= date <= date_to:
+                        records.append({
+                            "날짜": date.replace(".", ""),
+                            "Symbol": code,
+                            "외국인순매수": foreign,
+                            "기관순매수": agency,
+                            "개인순매수": -(foreign + agency),
+                        })
+
+                if oldest > date_from and page < max_pages:
+                    pending.add(asyncio.ensure_future(work(code, page + 1)))
+
+    return records, stats
+
+
+def backfill_supply(codes, date_from, date_to, limiter=None, per_host=None, timeout=5, retries=3, max_pages=50):
+    """codes의 [date_from, date_to] 수급 이력을 DataFrame[날짜, Symbol, 외국인/기관/개인순매수]로 모은다."""
+    date_from, date_to = normalize_date(date_from), normalize_date(date_to)
+    limiter = limiter or get_controller("naver")
+    records, stats = asyncio.run(
+        _backfill(codes, date_from, date_to, limiter, per_host, timeout, retries, max_pages)
+    )
+    print(f"\n✅ 백필 수집 완료: 페이지 {stats['pages']}개 (실패 {stats['failed']}), "
+          f"레코드 {len(records)}개", flush=True)
+    columns = ["날짜", "Symbol", "외국인순매수", "기관순매수", "개인순매수"]
+    return pd.DataFrame(records, columns=columns)
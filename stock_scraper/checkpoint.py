@@ -0,0 +1,119 @@
+import sqlite3
+
+import pandas as pd
+
+# ---------------------------------------------------------
+# 로컬 체크포인트 저장소 (SQLite)
+# - 수급 레코드를 (날짜, Code) 키로 수집 즉시 저장 -> 중간에 죽어도 이어받기 가능
+# - 최종 result_df도 저장해 두고, DB 저장 성공 여부를 기록 -> DB 저장만 재시도 가능
+# - 시간 예산 안에 못 받은 종목(tail)을 남겨 두고 다음 --resume 때 그것만 수집
+# ---------------------------------------------------------
+SUPPLY_COLS = ["외국인순매수", "기관순매수", "개인순매수"]
+
+
+class CheckpointStore:
+    def __init__(self, path, commit_every=100):
+        self.path = path
+        self.commit_every = commit_every
+        self._pending = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS supply ("
+            " 날짜 TEXT NOT NULL, Code TEXT NOT NULL,"
+            " 외국인순매수 INTEGER, 기관순매수 INTEGER, 개인순매수 INTEGER,"
+            " PRIMARY KEY (날짜, Code))"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " 날짜 TEXT PRIMARY KEY, written INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tail ("
+            " 날짜 TEXT NOT NULL, Code TEXT NOT NULL, PRIMARY KEY (날짜, Code))"
+        )
+        self.conn.commit()
+
+    # --- 수급 레코드 ---
+    def add(self, date, record):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO supply VALUES (?, ?, ?, ?, ?)",
+            (date, record["Code"], *(int(record[c]) for c in SUPPLY_COLS)),
+        )
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.flush()
+
+    def add_many(self, date, records):
+        for record in records:
+            self.add(date, record)
+        self.flush()
+
+    def flush(self):
+        self.conn.commit()
+        self._pending = 0
+
+    def load(self, date):
+        rows = self.conn.execute(
+            "SELECT Code, 외국인순매수, 기관순매수, 개인순매수 FROM supply WHERE 날짜 = ?", (date,)
+        ).fetchall()
+        return [dict(zip(["Code"] + SUPPLY_COLS, row)) for row in rows]
+
+    # --- 못 받은 종목 ---
+    def save_tail(self, date, codes):
+        self.conn.execute("DELETE FROM tail WHERE 날짜 = ?", (date,))
+        self.conn.executemany("INSERT INTO tail VALUES (?, ?)", [(date, code) for code in codes])
+        self.conn.commit()
+
+    def load_tail(self, date):
+        rows = self.conn.execute("SELECT Code FROM tail WHERE 날짜 = ?", (date,)).fetchall()
+        return [row[0] for row in rows]
+
+    # --- 최종 결과 ---
+    def _ensure_result_columns(self, result_df):
+        # 예전 버전이 만든 체크포인트는 컬럼이 모자랄 수 있음 (Symbol, 거래량비율 등)
+        # → 빠진 컬럼만 추가
+        existing = [row[1] for row in self.conn.execute('PRAGMA table_info("result")').fetchall()]
+        for col in result_df.columns:
+            if existing and col not in existing:
+                self.conn.execute(f'ALTER TABLE result ADD COLUMN "{col}"')
+
+    def save_result(self, date, result_df):
+        self._ensure_result_columns(result_df)
+        try:
+            self.conn.execute("DELETE FROM result WHERE 날짜 = ?", (date,))
+        except sqlite3.OperationalError:
+            pass  # 첫 저장이라 테이블이 아직 없음
+        result_df.to_sql("result", self.conn, if_exists="append", index=False)
+        self.conn.execute("INSERT OR REPLACE INTO runs (날짜, written) VALUES (?, 0)", (date,))
+        self.conn.commit()
+
+    def previous_result(self, date, cols):
+        """date 직전 날짜로 저장해 둔 결과의 (날짜, Symbol + cols). 없으면 (None, None)."""
+        try:
+            row = self.conn.execute("SELECT MAX(날짜) FROM result WHERE 날짜 < ?", (date,)).fetchone()
+        except sqlite3.OperationalError:
+            return None, None  # 결과를 저장한 적이 없음
+        if row is None or row[0] is None:
+            return None, None
+        col_sql = ", ".join(["Symbol"] + cols)
+        try:
+            df = pd.read_sql_query(f"SELECT {col_sql} FROM result WHERE 날짜 = ?", self.conn,
+                                   params=(row[0],))
+        except (sqlite3.OperationalError, pd.errors.DatabaseError):
+            return None, None  # 예전 스키마라 컬럼이 없음
+        return row[0], df
+
+    def pending_result(self, date):
+        """저장은 됐지만 DB에 아직 못 쓴 result_df. 없으면 None."""
+        row = self.conn.execute("SELECT written FROM runs WHERE 날짜 = ?", (date,)).fetchone()
+        if row is None or row[0]:
+            return None
+        return pd.read_sql_query("SELECT * FROM result WHERE 날짜 = ?", self.conn, params=(date,))
+
+    def mark_written(self, date):
+        self.conn.execute("UPDATE runs SET written = 1 WHERE 날짜 = ?", (date,))
+        self.conn.commit()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
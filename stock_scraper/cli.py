@@ -0,0 +1,201 @@
+import argparse
+import logging
+import sys
+
+from . import JobFailed
+
+# ---------------------------------------------------------
+# 명령행 진입점: python -m stock_scraper <서브커맨드> [옵션]
+#   scrape    오늘(--date) 시세 + 수급 수집 후 저장
+#   write     체크포인트에 남은 결과를 DB에만 다시 쓰기
+#   backfill  --from ~ --to 기간 수급 백필
+#   reprocess 원본 아카이브만으로 다시 파싱/저장
+#   merge     scrape --shard i/N 결과 파일 N개를 모아 한 번에 저장
+#   probe     상위 종목 몇 개로 오늘 수급 발표 여부만 확인 (pandas/DB 없이)
+#   daemon    장중 상주 수집
+# 이 모듈은 표준 라이브러리만 불러온다. 서브커맨드 핸들러가 필요한 모듈을 그때 불러온다.
+# ---------------------------------------------------------
+# 아래 기본값은 각 모듈의 상수와 같다 (--help 만으로 pandas/sqlalchemy를 불러오지 않도록 여기 적어 둠)
+# db_writer.DEFAULT_BATCH_SIZE / raw_archive.DEFAULT_ARCHIVE_DIR / snapshot_store.DEFAULT_SNAPSHOT_DIR /
+# aggregates.AGG_TABLE / shards.DEFAULT_SHARD_DIR
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_ARCHIVE_DIR = "raw_archive"
+DEFAULT_SHARD_DIR = "shards"
+DEFAULT_SNAPSHOT_DIR = "snapshots"
+AGG_TABLE = "Npaystocks_sector"
+
+
+def common_options():
+    group = argparse.ArgumentParser(add_help=False)
+    group.add_argument("--date", help="수집 날짜 (YYYYMMDD, 기본: 오늘)")
+    group.add_argument("--checkpoint", default="scrap_checkpoint.db", help="로컬 체크포인트 파일 경로")
+    group.add_argument("--report", default="run_report.json", help="실행 리포트(JSON) 저장 경로")
+    group.add_argument("--universe-cache", default="universe_cache.db", help="종목 유니버스 캐시 파일 경로")
+    group.add_argument("--universe-ttl", type=float, default=12.0,
+                       help="유니버스 캐시 유효 시간(시간). 이 안이면 가격 컬럼만 새로 받음")
+    group.add_argument("--snapshot-dir", default=DEFAULT_SNAPSHOT_DIR,
+                       help="결과를 날짜별 Parquet 스냅샷으로도 저장할 경로 (분석/대시보드용 로컬 미러)")
+    group.add_argument("--no-snapshot", action="store_true", help="Parquet 스냅샷 저장 안 함")
+    group.add_argument("--no-aggregates", action="store_true",
+                       help=f"DB 저장 뒤 업종/시장별 집계 테이블({AGG_TABLE}) 갱신 안 함")
+    group.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="DB 업서트 1회당 행 수")
+    group.add_argument("--write-mode", choices=["diff", "full"], default="diff",
+                       help="DB 저장 방식 (diff: 바뀐 행만 전송, full: 전체 업서트)")
+    return group
+
+
+def network_options():
+    group = argparse.ArgumentParser(add_help=False)
+    group.add_argument("--concurrency", type=int, default=20, help="네이버 동시 요청 수 시작값 (이후 자동 조절)")
+    group.add_argument("--max-concurrency", type=int, default=50, help="네이버 동시 요청 수 상한")
+    group.add_argument("--per-host", type=int, default=None, help="async 엔진 호스트당 커넥션 수 (기본: 상한과 같음)")
+    return group
+
+
+def negative_cache_options(parser):
+    parser.add_argument("--negative-cache", default="negative_cache.db", help="수급 행이 안 나오는 종목 캐시 파일 경로")
+    parser.add_argument("--negative-ttl", type=float, default=7.0, help="네거티브 캐시 유효 기간(일)")
+
+
+def supply_options():
+    group = argparse.ArgumentParser(add_help=False)
+    group.add_argument("--supply-source", choices=["bulk", "naver"], default="bulk",
+                       help="수급 소스 (bulk: pykrx 일괄 조회 후 빠진 종목만 네이버, naver: 전 종목 네이버)")
+    negative_cache_options(group)
+    group.add_argument("--no-prefilter", action="store_true",
+                       help="스팩/거래량 0 종목 사전 필터와 네거티브 캐시를 끄고 전 종목 요청")
+    group.add_argument("--probe", type=int, default=10,
+                       help="대량 수집 전에 먼저 확인할 시가총액 상위 종목 수 (0이면 생략)")
+    group.add_argument("--hedge-pct", type=float, default=95,
+                       help="요청이 최근 지연의 이 백분위수를 넘기면 같은 요청을 하나 더 보냄 (0이면 끔)")
+    group.add_argument("--hedge-rate", type=float, default=0.05, help="헤지 요청 상한 (전체 요청 대비 비율)")
+    return group
+
+
+def collect_options():
+    """scrape 전용 (daemon은 자기 async 세션/틱 스케줄러를 써서 해당 없음)."""
+    group = argparse.ArgumentParser(add_help=False)
+    group.add_argument("--engine", choices=["thread", "async"], default="thread",
+                       help="수급 수집 엔진 (thread: 기존 ThreadPool, async: aiohttp 커넥션 풀)")
+    group.add_argument("--resume", action="store_true",
+                       help="체크포인트 이어받기 (이미 받은 종목은 건너뛰고, 저장 못 한 결과는 DB 저장만 재시도)")
+    group.add_argument("--time-budget", type=float, default=None,
+                       help="수집 마감 시간(초, 실행 시작 기준). 넘기면 받은 것까지만 저장하고 나머지는 다음 --resume으로")
+    group.add_argument("--parse-workers", type=int, default=0,
+                       help="파싱 프로세스 수 (0: 받은 워커에서 바로 파싱, N: 수집/파싱 분리 파이프라인)")
+    group.add_argument("--parse-queue", type=int, default=256, help="파싱 대기 HTML 최대 개수 (넘으면 수집 대기)")
+    group.add_argument("--stream", action="store_true",
+                       help="압축 전송 + 스트리밍 파싱, 오늘 행을 찾으면 다운로드 중단 (--parse-workers와 같이 쓰면 파이프라인은 끔)")
+    return group
+
+
+def shard_spec(text):
+    """'i/N' -> (i, N). i는 0부터 N-1 (Actions 매트릭스 인덱스 그대로)."""
+    try:
+        index, shards = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"샤드는 i/N 형식이어야 합니다: {text}")
+    if shards < 1 or not 0 <= index < shards:
+        raise argparse.ArgumentTypeError(f"샤드 번호는 0 ~ N-1 이어야 합니다: {text}")
+    return index, shards
+
+
+def shard_dir_option(parser):
+    parser.add_argument("--shard-dir", default=DEFAULT_SHARD_DIR, help="샤드 결과 파일 폴더")
+
+
+def archive_option(parser, help_text):
+    parser.add_argument("--archive", nargs="?", const=DEFAULT_ARCHIVE_DIR, default=None, help=help_text)
+
+
+def run_job(args):
+    import ssl
+
+    from .job import ScrapeJob
+
+    # SSL 인증서 검증 설정 (KIND 다운로드 페이지 등)
+    ssl._create_default_https_context = ssl._create_unverified_context
+    job = ScrapeJob(args)
+    try:
+        return getattr(job, "run_" + args.command)()
+    finally:
+        # 실행 계측 리포트 (어떤 경로로 종료되든 마지막에 JSON으로 저장)
+        job.finish_report()
+
+
+def run_probe(args):
+    from .probe import run_probe
+
+    return run_probe(args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="stock_scraper", description="KRX 전 종목 수급 수집기")
+    parser.add_argument("--log-level", default="WARNING",
+                        help="로깅 레벨 (기본 WARNING, DEBUG면 urllib3 요청까지 모두 출력)")
+    sub = parser.add_subparsers(dest="command", required=True, metavar="<command>")
+    common, network = common_options(), network_options()
+    supply, collect = supply_options(), collect_options()
+
+    scrape = sub.add_parser("scrape", parents=[common, network, supply, collect],
+                            help="오늘(--date) 시세 + 수급 수집 후 저장")
+    archive_option(scrape, f"원본 응답을 날짜별 압축 아카이브로 저장 (경로 생략 시 {DEFAULT_ARCHIVE_DIR})")
+    shards = scrape.add_mutually_exclusive_group()
+    shards.add_argument("--shard", type=shard_spec, default=None,
+                        help="i/N: 종목 코드 해시로 나눈 N개 중 i번(0부터)만 수집하고 DB 대신 샤드 파일로 저장 (merge로 병합)")
+    shards.add_argument("--local-shards", type=int, default=0,
+                        help="N: 샤드 N개를 로컬 프로세스로 동시에 돌리고 바로 병합/저장 (--max-concurrency는 프로세스마다 적용)")
+    shard_dir_option(scrape)
+    scrape.set_defaults(handler=run_job)
+
+    merge = sub.add_parser("merge", parents=[common], help="scrape --shard 결과 파일을 모아 병합 후 DB에 한 번 저장")
+    shard_dir_option(merge)
+    merge.add_argument("--shards", type=int, default=None, help="기대하는 샤드 수 N (기본: 파일에서 읽음)")
+    negative_cache_options(merge)
+    merge.set_defaults(handler=run_job)
+
+    write = sub.add_parser("write", parents=[common], help="체크포인트에 남은 결과를 DB에만 다시 쓰기")
+    write.set_defaults(handler=run_job)
+
+    backfill = sub.add_parser("backfill", parents=[common, network], help="--from ~ --to 기간 수급 백필")
+    backfill.add_argument("--from", dest="date_from", required=True, help="백필 시작일 (YYYYMMDD)")
+    backfill.add_argument("--to", dest="date_to", help="백필 종료일 (YYYYMMDD, 기본: 오늘)")
+    backfill.set_defaults(handler=run_job)
+
+    reprocess = sub.add_parser("reprocess", parents=[common], help="--date 날짜를 원본 아카이브만으로 다시 파싱/저장")
+    archive_option(reprocess, f"읽을 원본 아카이브 경로 (기본 {DEFAULT_ARCHIVE_DIR})")
+    reprocess.set_defaults(handler=run_job)
+
+    probe = sub.add_parser("probe", help="상위 종목으로 오늘 수급 발표 여부만 확인 (종료 코드 0 발표 / 2 아직 / 1 실패)")
+    probe.add_argument("--date", help="확인할 날짜 (YYYYMMDD, 기본: 오늘)")
+    probe.add_argument("--count", type=int, default=5, help="확인할 시가총액 상위 종목 수")
+    probe.add_argument("--codes", help="직접 지정할 종목 코드 (쉼표 구분)")
+    probe.add_argument("--universe-cache", default="universe_cache.db", help="상위 종목을 고를 유니버스 캐시")
+    probe.set_defaults(handler=run_probe)
+
+    daemon = sub.add_parser("daemon", parents=[common, network, supply],
+                            help="장중 상주 수집 (전 종목 수급이 확정될 때까지 틱 반복)")
+    daemon.add_argument("--interval", type=float, default=5.0, help="daemon 틱 간격(분)")
+    daemon.add_argument("--until", default="21:00", help="daemon 종료 시각 (KST HH:MM, 확정이 덜 됐어도 종료)")
+    daemon.add_argument("--close-time", default="15:30", help="daemon 장 마감 시각 (KST HH:MM, 이후 값만 확정 판단)")
+    daemon.add_argument("--final-after", type=int, default=2,
+                        help="daemon: 장 마감 뒤 연속 이 횟수만큼 같은 값이면 그 종목 수급 확정")
+    daemon.set_defaults(handler=run_job)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    args = build_parser().parse_args(argv)
+    # --local-shards가 하위 프로세스에 같은 옵션을 넘길 때 씀
+    args.argv = argv
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.WARNING))
+    try:
+        return args.handler(args)
+    except JobFailed as e:
+        print(f"\n❌ {e}", flush=True)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from .aggregates import update_aggregates
+from .db_writer import write_result
+from .derived_metrics import add_volume_metrics, previous_volume
+from .naver_async import WarmFetcher
+from .naver_parser import parse_supply_row
+from .negative_cache import prefilter
+from .result_builder import build_result
+from .supply import to_record
+from .universe_cache import fetch_listing_pykrx, fetch_prices_bulk, refresh_prices, static_part
+
+# ---------------------------------------------------------
+# 장중 상주 수집기 (python -m stock_scraper daemon)
+# - 하루 3번 콜드 스타트(pip/임포트/핑/전체 리스트/새 연결) 대신 한 프로세스가 내부 스케줄러로 계속 돈다
+# - 이벤트 루프 + aiohttp 세션(keep-alive), DB 엔진, 종목 유니버스를 실행 내내 재사용
+# - 틱마다 가격은 pykrx 일괄 조회로 새로 받고, 수급은 아직 확정 안 된 종목만 다시 받는다
+#   (--supply-source bulk면 pykrx 수급 일괄 조회 3번으로 먼저 채우고, 빠진 종목만 네이버)
+#   확정: 장 마감 뒤, 오늘 행이 한 종목이라도 올라온 다음부터 연속 final_after번 같은 값
+#   발표가 시작된 뒤에도 계속 행이 없는 종목(거래정지 등)은 확정과 따로 세서 빈 종목으로 정리
+#   (발표 전의 빈 페이지 / 프로브 미스는 어느 쪽에도 세지 않음)
+# - 전 종목이 확정되면 그날은 종료 (--until 시각이 지나도 종료)
+# - DB 쓰기는 diff 모드라 틱마다 바뀐 행만 전송
+# ---------------------------------------------------------
+KST = ZoneInfo("Asia/Seoul")
+
+
+def parse_hhmm(text):
+    return datetime.strptime(text, "%H:%M").time()
+
+
+class IntradayCollector:
+    def __init__(self, target_date, engine, store, naver_rate, krx_rate, universe, negative=None,
+                 listing_url=None, close_time="15:30", final_after=2, probe=10, hedger=None, per_host=None,
+                 batch_size=500, aggregates=True, bulk=True):
+        self.target_date = target_date
+        self.today_str = datetime.strptime(target_date, "%Y%m%d").strftime("%Y.%m.%d")
+        self.engine = engine
+        self.store = store
+        self.krx_rate = krx_rate
+        self.universe = universe
+        self.negative = negative
+        self.listing_url = listing_url
+        self.close_time = parse_hhmm(close_time)
+        self.final_after = final_after
+        self.probe = probe
+        self.batch_size = batch_size
+        self.aggregates = aggregates
+        self.bulk = bulk
+        self.fetcher = WarmFetcher(naver_rate, per_host=per_host, hedger=hedger)
+
+        self.static = None
+        self.df_krx = None
+        self.codes = None
+        self.rows = {}      # code -> 마지막으로 본 수급 레코드 (오늘 행이 없으면 None)
+        self.streak = {}    # code -> 장 마감 뒤 같은 값이 연속으로 나온 횟수
+        self.final = set()
+        self.published = False  # 오늘 행을 한 번이라도 봤는지 (그 전에는 확정 판단 안 함)
+        self.empty_ticks = {}   # code -> 발표 뒤에도 오늘 행이 없던 틱 수
+        self.empty = set()      # 발표 뒤 final_after번 연속 행이 없던 종목 (더 요청 안 함)
+        self.ticks = 0
+        self.prev = None
+        self.prev_loaded = False
+
+    # --- 종목 리스트 / 가격 ---
+    def load_listing(self):
+        if self.listing_url:
+            # 오프라인 벤치마크 대역 서버 (가격 포함 CSV)
+            return pd.read_csv(self.listing_url, dtype={"Code": str})
+        if self.static is None:
+            cached_df, _ = self.universe.load()
+            self.static = static_part(cached_df) if cached_df is not None else None
+        df = None
+        if self.static is not None:
+            df = refresh_prices(self.static, fetch_prices_bulk(self.target_date, self.krx_rate))
+        if df is None:
+            # 캐시 없음 / 신규 상장 -> 전체 리스트 (pykrx 일괄 조회)
+            df = fetch_listing_pykrx(self.target_date, self.krx_rate)
+            if df.empty:
+                return None
+            self.universe.save(df)
+            self.static = static_part(df)
+        return df
+
+    def select_codes(self, df_krx):
+        """수집 대상 (스팩/거래정지/네거티브 캐시 제외, 시가총액 큰 순)."""
+        skipped = set(prefilter(df_krx))
+        if self.negative is not None:
+            skipped |= self.negative.known_empty()
+        df = df_krx[~df_krx["Code"].isin(skipped)]
+        if "Marcap" in df.columns:
+            df = df.assign(_cap=pd.to_numeric(df["Marcap"], errors="coerce").fillna(0))
+            df = df.sort_values("_cap", ascending=False)
+        return df["Code"].tolist()
+
+    # --- 수급 ---
+    def scrape(self, codes):
+        """(결과 {code: 레코드 또는 None}). 페이지를 못 받은 종목은 빠진다."""
+        results = {}
+
+        def parse(code, html):
+            row = parse_supply_row(html, self.today_str)
+            results[code] = to_record(code, row) if row else None
+            return results[code]
+
+        self.fetcher.fetch(codes, parse)
+        return results
+
+    def scrape_bulk(self, codes):
+        """pykrx 일괄 조회로 받은 종목만 {code: 레코드}. 미발표/실패면 빈 dict."""
+        from .supply_source import bulk_supply_records
+
+        return {r["Code"]: r for r in bulk_supply_records(self.target_date, codes)}
+
+    def after_close(self):
+        now = datetime.now(KST)
+        return now.strftime("%Y%m%d") > self.target_date or now.time() >= self.close_time
+
+    def tick(self):
+        """틱 한 번: 가격 갱신 -> 미확정 종목 수급 -> 병합/저장. 전 종목이 확정됐으면 True."""
+        self.ticks += 1
+        closed = self.after_close()
+        df_krx = self.load_listing()
+        if df_krx is not None and not df_krx.empty:
+            self.df_krx = df_krx
+        if self.df_krx is None:
+            print("⚠️ 종목 리스트를 아직 못 받았습니다. 다음 틱에서 재시도", flush=True)
+            return False
+        if self.codes is None:
+            self.codes = self.select_codes(self.df_krx)
+
+        todo = [c for c in self.codes if c not in self.final and c not in self.empty]
+        results = self.scrape_bulk(todo) if self.bulk and todo else {}
+        todo = [c for c in todo if c not in results]
+        # 아직 오늘 행을 하나도 못 봤으면 상위 종목만 먼저 (장중/미발표면 나머지 생략)
+        if self.probe > 0 and not any(self.rows.values()) and not results and len(todo) > self.probe:
+            results = self.scrape(todo[:self.probe])
+            if results and not any(results.values()):
+                print(f"⏭️ [틱 {self.ticks}] 프로브 종목에 오늘 행이 없어 수급 수집 생략", flush=True)
+                todo = []
+            else:
+                todo = todo[self.probe:]
+        results.update(self.scrape(todo))
+
+        self.published = self.published or any(results.values())
+        changed = 0
+        for code, record in results.items():
+            same = code in self.rows and self.rows[code] == record
+            changed += not same
+            self.rows[code] = record
+            if closed and self.published:
+                self.settle(code, record, same)
+
+        self.save()
+        found = sum(1 for r in self.rows.values() if r)
+        print(f"🔁 [틱 {self.ticks}] {'마감 후' if closed else '장중'} 요청 {len(results)}개 / 변경 {changed}개 / "
+              f"수급 {found}개 / 확정 {len(self.final)}/{len(self.codes)} (빈 종목 {len(self.empty)})", flush=True)
+        return closed and len(self.final) + len(self.empty) >= len(self.codes)
+
+    def settle(self, code, record, same):
+        """발표 시작 뒤 마감 후 틱에서만 호출. 값이 있는 행만 확정 streak에 센다."""
+        if record is None:
+            self.streak.pop(code, None)
+            self.empty_ticks[code] = self.empty_ticks.get(code, 0) + 1
+            if self.empty_ticks[code] >= self.final_after:
+                self.empty.add(code)
+            return
+        self.empty_ticks.pop(code, None)
+        self.streak[code] = self.streak.get(code, 0) + 1 if same and self.streak.get(code) else 1
+        if self.streak[code] >= self.final_after:
+            self.final.add(code)
+
+    # --- 저장 ---
+    def save(self):
+        result_df, _ = build_result(self.df_krx, [r for r in self.rows.values() if r], self.target_date)
+        if not self.prev_loaded:
+            # 직전 거래일 거래량은 하루 동안 안 바뀌므로 한 번만 읽음
+            _, self.prev, _ = previous_volume(self.engine, self.target_date, self.store)
+            self.prev_loaded = True
+        add_volume_metrics(result_df, self.prev)
+        self.store.save_result(self.target_date, result_df)
+        write_result(self.engine, result_df, batch_size=self.batch_size, mode="diff")
+        if self.aggregates:
+            update_aggregates(self.engine, result_df)
+        self.store.mark_written(self.target_date)
+
+    def close(self):
+        if self.negative is not None and self.published:
+            self.negative.record(self.target_date, sorted(self.empty), [c for c, r in self.rows.items() if r])
+            self.negative.close()
+        self.fetcher.close()
+
+
+def run_daemon(collector, interval_min=5.0, until="21:00"):
+    """collector.tick()을 interval_min 분 간격으로. 전 종목 확정 또는 until(KST) 시각에 종료."""
+    end = datetime.combine(datetime.now(KST).date(), parse_hhmm(until), tzinfo=KST)
+    print(f"🛰️ 상주 수집 시작 ({collector.target_date}, {interval_min:g}분 간격, {until} KST까지)", flush=True)
+    try:
+        while True:
+            start = time.monotonic()
+            try:
+                done = collector.tick()
+            except Exception as e:
+                # 한 틱이 실패해도 상주 프로세스는 유지 (다음 틱에서 재시도)
+                print(f"⚠️ [틱 {collector.ticks}] 실패: {e}", flush=True)
+                done = False
+            if done:
+                print(f"🏁 전 종목 수급 확정 → 오늘 수집 종료 (틱 {collector.ticks}회)", flush=True)
+                return True
+            wait = max(0.0, interval_min * 60 - (time.monotonic() - start))
+            if datetime.now(KST) + timedelta(seconds=wait) >= end:
+                left = len(collector.codes or []) - len(collector.final) - len(collector.empty)
+                print(f"🛑 {until} KST 도달 → 미확정 {left}개 남기고 종료", flush=True)
+                return False
+            time.sleep(wait)
+    finally:
+        collector.close()
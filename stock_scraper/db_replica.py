@@ -0,0 +1,63 @@
+import os
+import time
+
+from sqlalchemy import create_engine
+
+# ---------------------------------------------------------
+# Turso 엔진
+# - 수집 경로는 원격 엔진만 쓴다: sqlite+libsql://host/?secure=true
+#   (diff 모드의 해시 읽기는 db_writer가 쓰기 트랜잭션 전에 따로 읽는다)
+# - replica_engine / sync (임베디드 레플리카 + sync_url)는 bench_db.py 측정용으로만 남겨 둔다.
+#   드라이버가 쓰기를 primary로 넘기는지, 로컬 쓰기 후 sync 한 번으로 올라가는지를 실제 Turso로
+#   검증하기 전까지는 수집/데몬 옵션으로 열지 않는다.
+# - libsql-experimental / sqlalchemy-libsql 버전은 requirements.txt에서 고정하지 않았다.
+# ---------------------------------------------------------
+def turso_host(raw_url):
+    host = raw_url.replace("https://", "").replace("libsql://", "").replace("wss://", "")
+    return host.split("/")[0]
+
+
+def remote_engine(raw_url, auth_token):
+    return create_engine(f"sqlite+libsql://{turso_host(raw_url)}/?secure=true",
+                         connect_args={"auth_token": auth_token})
+
+
+def replica_engine(path, raw_url, auth_token):
+    """로컬 레플리카 파일 엔진 (sync_url로 Turso와 동기화). bench_db.py 전용."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    return create_engine(f"sqlite+libsql:///{path}",
+                         connect_args={"sync_url": f"libsql://{turso_host(raw_url)}", "auth_token": auth_token})
+
+
+def engine_from_env():
+    """환경변수로 엔진 생성. 설정이 없으면 None.
+
+    TURSO_DB_URL / TURSO_AUTH_TOKEN, 로컬 테스트용으로 TURSO_DB_URL 없이 LOCAL_DB_URL
+    (예: sqlite:///bench.db, sqlite+libsql:///bench.db)
+    """
+    raw_url = os.environ.get("TURSO_DB_URL", "").strip()
+    auth_token = os.environ.get("TURSO_AUTH_TOKEN", "").strip()
+
+    if not raw_url:
+        local_url = os.environ.get("LOCAL_DB_URL", "").strip()
+        if local_url:
+            print(f"🔌 로컬 DB 연결... ({local_url})", flush=True)
+            return create_engine(local_url)
+
+    if not raw_url or not auth_token:
+        return None
+
+    print(f"🔌 Turso DB 연결...", flush=True)
+    return remote_engine(raw_url, auth_token)
+
+
+def sync(engine):
+    """레플리카를 원격과 동기화하고 걸린 시간(초)을 돌려준다."""
+    start = time.perf_counter()
+    raw = engine.raw_connection()
+    try:
+        raw.driver_connection.sync()
+    finally:
+        raw.close()
+    return time.perf_counter() - start
@@ -0,0 +1,208 @@
+import time
+
+import pandas as pd
+
+from .run_report import get_report
+
+# ---------------------------------------------------------
+# Npaystocks 배치 업서트 writer
+# - (날짜, Symbol) 유니크 인덱스 기준 INSERT ... ON CONFLICT DO UPDATE
+# - DELETE + to_sql(500건씩) 대신 다중 행 INSERT 묶음을 한 트랜잭션으로 전송
+# - diff 모드: 행 내용 해시(row_hash)를 비교해서 바뀐 행만 전송
+# ---------------------------------------------------------
+TABLE = "Npaystocks"
+KEY_COLS = ["날짜", "Symbol"]
+COLUMNS = [
+    ("날짜", "TEXT"),
+    ("Symbol", "TEXT"),
+    ("종목명", "TEXT"),
+    ("구분", "TEXT"),
+    ("업종명", "TEXT"),
+    ("시가", "INTEGER"),
+    ("고가", "INTEGER"),
+    ("저가", "INTEGER"),
+    ("현재가", "INTEGER"),
+    ("전일비", "INTEGER"),
+    ("등락률", "REAL"),
+    ("거래량", "INTEGER"),
+    ("전일거래량", "INTEGER"),
+    ("거래량비율", "REAL"),
+    ("시가총액", "INTEGER"),
+    ("상장주식수", "INTEGER"),
+    ("외국인순매수", "INTEGER"),
+    ("기관순매수", "INTEGER"),
+    ("개인순매수", "INTEGER"),
+    ("신용잔고율", "REAL"),
+    ("row_hash", "INTEGER"),
+]
+HASH_COL = "row_hash"
+DEFAULT_BATCH_SIZE = 500
+
+
+def table_columns(conn, table=TABLE):
+    return [row[1] for row in conn.exec_driver_sql(f'PRAGMA table_info("{table}")').fetchall()]
+
+
+def ensure_schema(conn, table=TABLE, columns=COLUMNS, key_cols=KEY_COLS):
+    """테이블/빠진 컬럼/키 유니크 인덱스(기본 (날짜, Symbol))가 없으면 만든다."""
+    existing = table_columns(conn, table)
+    if not existing:
+        cols = ", ".join(f'"{name}" {typ}' for name, typ in columns)
+        conn.exec_driver_sql(f'CREATE TABLE "{table}" ({cols})')
+    else:
+        for name, typ in columns:
+            if name not in existing:
+                conn.exec_driver_sql(f'ALTER TABLE "{table}" ADD COLUMN "{name}" {typ}')
+    index = f"ux_{table}_date_symbol" if key_cols == KEY_COLS else f"ux_{table}_key"
+    key_sql = ", ".join(f'"{c}"' for c in key_cols)
+    conn.exec_driver_sql(f'CREATE UNIQUE INDEX IF NOT EXISTS "{index}" ON "{table}" ({key_sql})')
+
+
+def with_row_hash(df):
+    """키/해시를 뺀 값 컬럼으로 행마다 64비트 내용 해시를 붙인 복사본."""
+    value_cols = [c for c in df.columns if c not in KEY_COLS and c != HASH_COL]
+    hashed = pd.util.hash_pandas_object(df[value_cols], index=False)
+    out = df.copy()
+    # SQLite INTEGER는 부호 있는 64비트라 uint64를 그대로 재해석
+    out[HASH_COL] = hashed.values.view("int64")
+    return out
+
+
+def _rows(df, cols):
+    # sqlite 드라이버는 numpy 타입을 못 받으므로 파이썬 기본 타입으로 변환
+    values = df[cols].astype(object).where(pd.notna(df[cols]), None)
+    return values.values.tolist()
+
+
+def upsert_rows(conn, df, table=TABLE, batch_size=DEFAULT_BATCH_SIZE, columns=COLUMNS, key_cols=KEY_COLS):
+    """df를 batch_size 행씩 다중 행 업서트. 보낸 행 수를 돌려준다."""
+    cols = [name for name, _ in columns if name in df.columns]
+    col_sql = ", ".join(f'"{c}"' for c in cols)
+    key_sql = ", ".join(f'"{c}"' for c in key_cols)
+    update_sql = ", ".join(f'"{c}" = excluded."{c}"' for c in cols if c not in key_cols)
+    row_sql = "(" + ", ".join("?" for _ in cols) + ")"
+
+    rows = _rows(df, cols)
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        sql = (
+            f'INSERT INTO "{table}" ({col_sql}) VALUES {", ".join([row_sql] * len(batch))} '
+            f'ON CONFLICT ({key_sql}) DO UPDATE SET {update_sql}'
+        )
+        conn.exec_driver_sql(sql, tuple(v for row in batch for v in row))
+    return len(rows)
+
+
+def delete_rows(conn, date, symbols, table=TABLE, batch_size=DEFAULT_BATCH_SIZE):
+    for start in range(0, len(symbols), batch_size):
+        batch = symbols[start:start + batch_size]
+        marks = ", ".join("?" for _ in batch)
+        conn.exec_driver_sql(f'DELETE FROM "{table}" WHERE 날짜 = ? AND Symbol IN ({marks})', (date, *batch))
+    return len(symbols)
+
+
+def adopt_legacy_rows(conn, df, table=TABLE):
+    """Symbol 없이 저장된 예전 행에 (날짜, 종목명)으로 Symbol을 채워 넣는다.
+
+    partial 업서트가 예전 가격 행 옆에 수급만 있는 행을 새로 만드는 대신 그 행을 갱신하게 한다.
+    같은 (날짜, Symbol) 행이 이미 있으면 건드리지 않는다 (유니크 인덱스 충돌 방지).
+    """
+    rows = [(symbol, date, name, date, symbol) for date, symbol, name in _rows(df, ["날짜", "Symbol", "종목명"])]
+    if rows:
+        conn.exec_driver_sql(
+            f'UPDATE "{table}" SET Symbol = ? WHERE 날짜 = ? AND 종목명 = ? AND Symbol IS NULL '
+            f'AND NOT EXISTS (SELECT 1 FROM "{table}" WHERE 날짜 = ? AND Symbol = ?)',
+            rows,
+        )
+
+
+def fetch_hashes(conn, date, table=TABLE):
+    """date의 (Symbol, row_hash). 테이블이나 해시 컬럼이 아직 없으면 빈 DataFrame."""
+    if HASH_COL not in table_columns(conn, table):
+        return pd.DataFrame(columns=["Symbol", HASH_COL])
+    rows = conn.exec_driver_sql(f'SELECT Symbol, {HASH_COL} FROM "{table}" WHERE 날짜 = ? AND Symbol IS NOT NULL',
+                                (date,)).fetchall()
+    return pd.DataFrame(rows, columns=["Symbol", HASH_COL])
+
+
+def fetch_previous_day(conn, date, cols, table=TABLE):
+    """date 직전 거래일의 (날짜, Symbol + cols)를 쿼리 한 번으로. 없으면 (None, 빈 DataFrame)."""
+    col_sql = ", ".join(f'"{c}"' for c in ["Symbol"] + cols)
+    rows = conn.exec_driver_sql(
+        f'SELECT 날짜, {col_sql} FROM "{table}" '
+        f'WHERE 날짜 = (SELECT MAX(날짜) FROM "{table}" WHERE 날짜 < ?) AND Symbol IS NOT NULL',
+        (date,),
+    ).fetchall()
+    df = pd.DataFrame(rows, columns=["날짜", "Symbol"] + cols)
+    prev_date = df["날짜"].iloc[0] if len(df) else None
+    return prev_date, df.drop(columns="날짜")
+
+
+def diff_rows(df, old):
+    """df(새 결과)와 old(Symbol, row_hash)를 비교해 (보낼 행, 지울 Symbol, 요약) 반환."""
+    merged = df[["Symbol", HASH_COL]].merge(old, on="Symbol", how="outer",
+                                            suffixes=("", "_old"), indicator=True)
+    both = merged["_merge"] == "both"
+    inserted = merged["_merge"] == "left_only"
+    # 예전 행에 해시가 없으면(NULL) 비교가 안 되므로 변경으로 취급
+    changed = both & (merged[HASH_COL] != merged[HASH_COL + "_old"])
+    deleted = merged["_merge"] == "right_only"
+
+    send = set(merged.loc[inserted | changed, "Symbol"])
+    summary = {
+        "insert": int(inserted.sum()),
+        "update": int(changed.sum()),
+        "delete": int(deleted.sum()),
+        "same": int((both & ~changed).sum()),
+    }
+    return df[df["Symbol"].isin(send)], merged.loc[deleted, "Symbol"].tolist(), summary
+
+
+def write_result(engine, df, table=TABLE, batch_size=DEFAULT_BATCH_SIZE, mode="full", partial=False):
+    """스키마 확인 + 업서트를 한 트랜잭션으로 실행하고 처리량을 출력한다.
+
+    mode="diff"면 같은 날짜의 기존 row_hash와 비교해 신규/변경 행만 업서트하고
+    이번 결과에 없는 행은 삭제한다.
+    partial=True면 df에 있는 컬럼만 갱신하고(백필 등) row_hash는 비워서 다음 diff 때 변경으로 잡히게 한다.
+    """
+    if partial:
+        df = df.assign(**{HASH_COL: None})
+        mode = "full"
+    else:
+        df = with_row_hash(df)
+    start = time.perf_counter()
+    old_hashes = {}
+    if mode == "diff":
+        # 비교용 해시는 쓰기 트랜잭션 전에 별도 읽기 연결로 (쓰기 트랜잭션 안에는 쓰기만 보냄)
+        with engine.connect() as conn:
+            old_hashes = {date: fetch_hashes(conn, date, table) for date in df["날짜"].unique().tolist()}
+    with engine.begin() as conn:
+        ensure_schema(conn, table)
+        # 같은 날짜에 Symbol 없이 저장됐던 예전 행은 키로 덮어쓸 수 없으므로 정리
+        # (partial은 가격 컬럼을 안 가지고 있어서 지우면 그 날짜 가격이 사라짐 → Symbol을 채워 그 행에 병합)
+        if partial and "종목명" in df.columns:
+            adopt_legacy_rows(conn, df, table)
+        elif not partial:
+            for date in df["날짜"].unique().tolist():
+                conn.exec_driver_sql(f'DELETE FROM "{table}" WHERE 날짜 = ? AND Symbol IS NULL', (date,))
+        if mode == "diff":
+            written = deleted = 0
+            for date, day_df in df.groupby("날짜", sort=False):
+                send_df, gone, summary = diff_rows(day_df, old_hashes[date])
+                print(f"🔍 변경 감지 ({date}): 신규 {summary['insert']} / 변경 {summary['update']} / "
+                      f"삭제 {summary['delete']} / 동일 {summary['same']}", flush=True)
+                get_report().set(f"diff_{date}", summary)
+                written += upsert_rows(conn, send_df, table, batch_size)
+                deleted += delete_rows(conn, date, gone, table, batch_size)
+        else:
+            written = upsert_rows(conn, df, table, batch_size)
+    elapsed = time.perf_counter() - start
+    rate = written / elapsed if elapsed > 0 else 0
+    get_report().set("db_write", {
+        "mode": mode, "partial": partial, "batch_size": batch_size, "rows_total": len(df),
+        "rows_written": written, "sec": round(elapsed, 3), "rows_per_sec": round(rate, 1),
+    })
+    print(f"💾 업서트 {written}건 / {elapsed:.2f}초 ({rate:,.0f} rows/sec, 배치 {batch_size})", flush=True)
+    if mode == "diff":
+        print(f"   전송 {written}/{len(df)}건 ({written / max(len(df), 1):.0%}), 삭제 {deleted}건", flush=True)
+    return written
@@ -0,0 +1,48 @@
+import pandas as pd
+
+from .db_writer import TABLE, fetch_previous_day
+
+# ---------------------------------------------------------
+# 파생 지표 (전일거래량, 거래량비율)
+# - 직전 거래일의 (Symbol, 거래량)을 DB 쿼리 한 번으로 읽고 (실패하면 로컬 체크포인트)
+# - 오늘 결과에 Symbol 기준 벡터 조인해서 한 번에 채운다
+#   (대시보드가 종목마다 전날 행을 다시 조회하지 않아도 됨)
+# ---------------------------------------------------------
+
+
+def previous_volume(engine, date, store=None, table=TABLE):
+    """(직전 거래일, DataFrame[Symbol, 거래량], 출처). 못 구하면 (None, None, None).
+
+    engine이 None이면 (DB 설정 없음) 로컬 체크포인트만 본다.
+    """
+    if engine is not None:
+        try:
+            with engine.connect() as conn:
+                prev_date, prev = fetch_previous_day(conn, date, ["거래량"], table)
+            if prev_date:
+                return prev_date, prev, "db"
+        except Exception as e:
+            print(f"⚠️ 직전 거래일 조회 실패 (로컬 체크포인트로 대체): {e}", flush=True)
+    if store is not None:
+        prev_date, prev = store.previous_result(date, ["거래량"])
+        if prev_date:
+            return prev_date, prev, "checkpoint"
+    return None, None, None
+
+
+def add_volume_metrics(result_df, prev):
+    """result_df의 전일거래량/거래량비율을 채운다 (거래량비율 = 거래량 / 전일거래량, 전일 0이면 0)."""
+    if prev is None or prev.empty:
+        prev_volume = pd.Series(0, index=result_df.index, dtype="int64")
+    else:
+        volume_map = pd.to_numeric(prev.set_index("Symbol")["거래량"], errors="coerce")
+        volume_map = volume_map[~volume_map.index.duplicated(keep="last")]
+        prev_volume = result_df["Symbol"].map(volume_map).fillna(0).astype("int64")
+    ratio = result_df["거래량"] / prev_volume.where(prev_volume > 0)
+
+    result_df["전일거래량"] = prev_volume
+    if "거래량비율" in result_df.columns:
+        result_df["거래량비율"] = ratio.fillna(0.0).round(3)
+    else:
+        result_df.insert(result_df.columns.get_loc("전일거래량") + 1, "거래량비율", ratio.fillna(0.0).round(3))
+    return int((prev_volume > 0).sum())
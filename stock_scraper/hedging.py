@@ -0,0 +1,127 @@
+import asyncio
+import collections
+import concurrent.futures
+import threading
+
+from .rate_control import OK
+
+# ---------------------------------------------------------
+# 헤지 요청 (느린 꼬리 지연 줄이기)
+# - 요청이 (제어기 슬롯을 받은 뒤부터) 최근 성공 지연의 p95를 넘기면 같은 요청을 하나 더 보내고 먼저 성공한 쪽을 쓴다
+# - 헤지는 전체 요청의 max_rate 비율까지만 (서버 부하/차단 방지)
+# - 지연 표본이 min_samples개 모이기 전에는 헤지하지 않음
+# ---------------------------------------------------------
+
+
+class Hedger:
+    def __init__(self, percentile=95, max_rate=0.05, min_samples=20, min_delay=0.05, window=200):
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.requests = 0
+        self.issued = 0
+        self.won = 0
+        self._latencies = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def delay(self):
+        """헤지를 보낼 대기 시간 (표본이 모자라면 None)."""
+        with self._lock:
+            self.requests += 1
+            if len(self._latencies) < self.min_samples:
+                return None
+            values = sorted(self._latencies)
+        idx = min(len(values) - 1, int(len(values) * self.percentile / 100))
+        return max(self.min_delay, values[idx])
+
+    def allow(self):
+        with self._lock:
+            if self.issued >= self.max_rate * self.requests:
+                return False
+            self.issued += 1
+            return True
+
+    def mark_won(self):
+        with self._lock:
+            self.won += 1
+
+    def summary(self):
+        return {"percentile": self.percentile, "max_rate": self.max_rate, "requests": self.requests,
+                "issued": self.issued, "won": self.won}
+
+
+def _noop():
+    pass
+
+
+async def hedged_async(hedger, attempt_fn):
+    """attempt_fn(on_start) -> 코루틴 (status, value). on_start는 실제 요청 직전에 호출.
+
+    먼저 성공한 결과, 둘 다 실패면 마지막 결과.
+    """
+    started = asyncio.Event()
+    primary = asyncio.ensure_future(attempt_fn(started.set))
+    backup = None
+    try:
+        # 슬롯 대기 시간은 빼고, 요청이 나간 뒤부터 잰다 (기준 지연도 그 시점 값)
+        waiter = asyncio.ensure_future(started.wait())
+        await asyncio.wait({primary, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        waiter.cancel()
+        delay = hedger.delay()
+        if delay is not None:
+            await asyncio.wait({primary}, timeout=delay)
+        if primary.done() or delay is None or not hedger.allow():
+            return await primary
+
+        backup = asyncio.ensure_future(attempt_fn(_noop))
+        pending = {primary, backup}
+        result = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if result[0] == OK:
+                    if task is backup:
+                        hedger.mark_won()
+                    return result
+        return result
+    finally:
+        # 진 쪽 요청은 취소 (연결 반납, 제어기 슬롯은 abandon으로 반납)
+        for task in (primary, backup):
+            if task is not None and not task.done():
+                task.cancel()
+
+
+def hedged_call(hedger, pool, attempt_fn):
+    """스레드용. attempt_fn(on_start) -> (status, value)를 pool에서 실행하고 필요하면 헤지.
+
+    requests는 중간에 끊을 수 없으므로 진 쪽 요청은 끝까지 돌고 결과만 버린다.
+    """
+    started = threading.Event()
+    primary = pool.submit(attempt_fn, started.set)
+    while not started.wait(0.05) and not primary.done():
+        pass
+    delay = hedger.delay()
+    if delay is None:
+        return primary.result()
+    done, _ = concurrent.futures.wait([primary], timeout=delay)
+    if done or not hedger.allow():
+        return primary.result()
+
+    backup = pool.submit(attempt_fn, _noop)
+    pending = {primary, backup}
+    result = None
+    while pending:
+        done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            result = future.result()
+            if result[0] == OK:
+                if future is backup:
+                    hedger.mark_won()
+                return result
+    return result
@@ -0,0 +1,521 @@
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from . import JobFailed, rate_control
+from .checkpoint import CheckpointStore
+from .run_report import get_report
+
+# ---------------------------------------------------------
+# [버전 6.3] 유연한 저장 모드 (수급 없으면 0으로 채우고 저장)
+# scrape / write / backfill / reprocess / daemon 서브커맨드가 공유하는 실행 단위
+# 1. 날짜  2. 종목 리스트  3~4. 수급 수집  5. 병합/파생 지표  6. 저장 (체크포인트 -> 스냅샷 -> DB -> 집계)
+# DB(sqlalchemy), 네이버 async 엔진, 원본 아카이브 등은 쓰는 단계에서만 불러온다.
+# ---------------------------------------------------------
+
+
+class ScrapeJob:
+    def __init__(self, args):
+        self.args = args
+        self.report = get_report()
+        self.report.meta.update({k: v for k, v in vars(args).items() if k != "handler"})
+
+        # 1. 날짜 설정 (자동, 과거 날짜 재실행은 --date 20260330)
+        today = datetime.now()
+        if args.date:
+            today = datetime.strptime(args.date.replace(".", ""), '%Y%m%d')
+        self.today_str = today.strftime('%Y.%m.%d')
+        self.target_date = today.strftime('%Y%m%d')
+        self.report.meta["target_date"] = self.target_date
+
+        # 수집 마감 시각 (--time-budget, 실행 시작 기준)
+        budget = getattr(args, "time_budget", None)
+        self.deadline = time.monotonic() + budget if budget else None
+
+        # 호스트별 적응형 속도 제어기 (네이버 / KRX·pykrx 공유)
+        self.naver_rate = rate_control.get_controller("naver", initial=getattr(args, "concurrency", 20),
+                                                      max_limit=getattr(args, "max_concurrency", 50))
+        self.krx_rate = rate_control.get_controller("krx", initial=2, min_limit=1, max_limit=4,
+                                                    latency_target=10.0)
+
+        # 체크포인트 저장소 (수집 결과를 (날짜, Code) 단위로 즉시 로컬에 기록)
+        self.store = CheckpointStore(args.checkpoint)
+        # 종목 리스트 대체 소스 (CSV URL/경로, 오프라인 벤치마크용). 설정되면 FDR 대신 사용
+        self.listing_url = os.environ.get("LISTING_URL", "").strip()
+        self._engine = None
+
+    def finish_report(self):
+        self.report.set("rate_control", [
+            {"name": c.name, "final_limit": c.limit, "counts": dict(c.counts),
+             "errors": dict(c.errors), "decisions": c.decisions}
+            for c in rate_control.all_controllers()
+        ])
+        self.report.write(self.args.report)
+
+    def banner(self):
+        print("🚀 [버전 6.3] 수급 수집기 (Partial Save Mode) 시작!", flush=True)
+        print(f"📅 수집 타겟 날짜: {self.today_str} (DB저장: {self.target_date})", flush=True)
+
+    # --- DB ---
+    def engine(self):
+        """DB 엔진 (Turso). 한 실행에서 한 번만 만들고 재사용."""
+        if self._engine is None:
+            from .db_replica import engine_from_env
+
+            engine = engine_from_env()
+            if engine is None:
+                raise JobFailed("환경변수(TURSO_DB_URL, TURSO_AUTH_TOKEN)가 설정되지 않았습니다.")
+            self._engine = engine
+        return self._engine
+
+    def has_db(self):
+        return bool((os.environ.get("TURSO_DB_URL", "").strip() and os.environ.get("TURSO_AUTH_TOKEN", "").strip())
+                    or os.environ.get("LOCAL_DB_URL", "").strip())
+
+    def save_aggregates(self, engine, result_df):
+        # 업종/시장별 집계 갱신 (실패해도 원본 저장은 그대로, 다음 실행에서 다시 계산됨)
+        from .aggregates import update_aggregates
+
+        self.report.start("aggregates")
+        try:
+            summary = update_aggregates(engine, result_df)
+            self.report.end("aggregates", ok=True, **summary)
+            print(f"🧮 업종/시장 집계 {summary['groups']}개 그룹 갱신 ({summary['sec']:.2f}초)", flush=True)
+        except Exception as e:
+            self.report.end("aggregates", ok=False, error=str(e))
+            print(f"⚠️ 업종/시장 집계 실패: {e}", flush=True)
+
+    def save_to_db(self, result_df):
+        """DB 저장 (6단계, write 서브커맨드는 단독 재시도). 실패하면 JobFailed (체크포인트에는 남아 있음)."""
+        from .db_writer import write_result
+
+        engine = self.engine()
+        self.report.start("db_write")
+        try:
+            # (날짜, Symbol) 키 기준 다중 행 업서트 (한 트랜잭션, diff 모드면 바뀐 행만)
+            write_result(engine, result_df, batch_size=self.args.batch_size, mode=self.args.write_mode)
+            if not self.args.no_aggregates:
+                self.save_aggregates(engine, result_df)
+
+            self.store.mark_written(self.target_date)
+            self.report.end("db_write", ok=True)
+            print(f"\n✅ [완전 성공] DB 저장 완료! (날짜: {self.target_date})", flush=True)
+
+        except Exception as e:
+            self.report.end("db_write", ok=False, error=str(e))
+            raise JobFailed(f"DB 저장 실패: {e}") from e
+
+    def save_snapshot(self, result_df):
+        # 로컬 Parquet 스냅샷 (DB 저장과 별개, 실패해도 실행은 계속)
+        if self.args.no_snapshot:
+            return
+        from .snapshot_store import write_snapshot
+
+        try:
+            path = write_snapshot(result_df, self.args.snapshot_dir, self.target_date)
+            if path:
+                print(f"🗂️ Parquet 스냅샷 저장: {path}", flush=True)
+        except Exception as e:
+            print(f"⚠️ Parquet 스냅샷 저장 실패: {e}", flush=True)
+
+    def write_pending(self):
+        """체크포인트에 저장됐지만 DB에 못 쓴 결과를 다시 쓴다. 없으면 False."""
+        pending_df = self.store.pending_result(self.target_date)
+        if pending_df is None:
+            return False
+        print(f"♻️ [이어받기] 저장 못 한 결과 {len(pending_df)}건 발견 → 수집 없이 DB 저장만 재시도", flush=True)
+        self.save_snapshot(pending_df)
+        self.save_to_db(pending_df)
+        return True
+
+    # --- 2. 종목 리스트 ---
+    def universe(self):
+        from .universe_cache import UniverseCache
+
+        return UniverseCache(self.args.universe_cache, ttl_hours=self.args.universe_ttl)
+
+    def load_listing(self, source=None):
+        """(df_krx, 출처). source: 재처리 모드의 RawArchive (그날 저장된 리스트를 씀)."""
+        self.report.start("listing")
+        if source is not None:
+            df_krx = source.load_listing() if source.exists() else None
+            if df_krx is None:
+                raise JobFailed(f"{self.target_date} 원본 아카이브(종목 리스트)가 없습니다: {source.data_path}")
+            print(f"🗄️ [재처리] 아카이브에서 종목 리스트 {len(df_krx)}개 복원", flush=True)
+            listing_source = "archive"
+        else:
+            from .listing import load_listing
+
+            df_krx, listing_source = load_listing(self.target_date, self.universe(), self.krx_rate,
+                                                  self.listing_url or None)
+        self.report.end("listing", rows=len(df_krx), source=listing_source)
+        return df_krx
+
+    # --- 3~4. 수급 ---
+    def collect_supply(self, df_krx, archive=None):
+        from .negative_cache import NegativeCache, prefilter
+        from .supply import NaverSupplyScraper
+
+        args, report, store = self.args, self.report, self.store
+        scraper = NaverSupplyScraper(args, self.today_str, self.target_date, store, self.naver_rate,
+                                     deadline=self.deadline, archive=archive)
+
+        # 4-0. 체크포인트 이어받기 (이미 받은 종목은 건너뜀)
+        codes = df_krx['Code'].tolist()
+        supply_data = []
+        if args.resume:
+            supply_data = store.load(self.target_date)
+            resumed = {r['Code'] for r in supply_data}
+            codes = [c for c in codes if c not in resumed]
+            # 지난 실행이 시간 예산으로 끊겼으면 못 받은 종목만
+            tail = set(store.load_tail(self.target_date))
+            if tail:
+                codes = [c for c in codes if c in tail]
+            print(f"♻️ [이어받기] 체크포인트에서 {len(resumed)}개 복원, 남은 {len(codes)}개만 수집", flush=True)
+
+        # 4-1. 일괄 수급 조회 (pykrx, 호출 3번으로 시장 전체)
+        if args.supply_source == "bulk" and codes:
+            from .supply_source import bulk_supply_records
+            print("📦 pykrx 전 종목 수급 일괄 조회 중...", flush=True)
+            report.start("bulk_supply")
+            bulk_data = bulk_supply_records(self.target_date, codes)
+            report.end("bulk_supply", rows=len(bulk_data))
+            store.add_many(self.target_date, bulk_data)
+            if archive and bulk_data: archive.put_bulk(bulk_data)
+            supply_data += bulk_data
+            bulk_done = {r['Code'] for r in bulk_data}
+            codes = [c for c in codes if c not in bulk_done]
+            print(f"✅ 일괄 조회로 {len(bulk_done)}개 확보, 남은 {len(codes)}개는 네이버에서 보충", flush=True)
+
+        # 4-1-1. 수급 행이 안 나오는 종목은 요청하지 않음 (병합 단계에서 0으로 채워짐)
+        negative = NegativeCache(args.negative_cache, ttl_days=args.negative_ttl)
+        if codes and not args.no_prefilter:
+            rule_skipped = prefilter(df_krx)
+            cached_empty = negative.known_empty() - set(rule_skipped)
+            before = len(codes)
+            codes = [c for c in codes if c not in rule_skipped and c not in cached_empty]
+            avoided = before - len(codes)
+            reasons = {}
+            for c in rule_skipped.values(): reasons[c] = reasons.get(c, 0) + 1
+            report.incr("naver.avoided_requests", avoided)
+            report.set("prefilter", {"rules": reasons, "negative_cache": len(cached_empty), "avoided": avoided})
+            print(f"🚫 사전 필터로 {avoided}개 요청 생략 (규칙 {reasons}, 네거티브 캐시 {len(cached_empty)}개)",
+                  flush=True)
+
+        # 시가총액 큰 종목부터 (발표가 빠르고, 중간에 끊겨도 중요한 종목은 확보)
+        if 'Marcap' in df_krx.columns:
+            marcap = dict(zip(df_krx['Code'], pd.to_numeric(df_krx['Marcap'], errors='coerce').fillna(0)))
+            codes.sort(key=lambda c: -marcap.get(c, 0))
+
+        scraper.start_pipeline(codes)
+        report.start("scrape")
+        naver_before = len(supply_data)
+
+        # 4-2-1. 프로브: 아직 확보한 수급이 없으면 상위 몇 종목만 먼저 받아보고,
+        #        오늘 행이 하나도 없으면 (장중/미발표) 대량 수집을 건너뛰고 가격만 저장
+        if args.probe > 0 and not supply_data and len(codes) > args.probe:
+            probe_codes, codes = codes[:args.probe], codes[args.probe:]
+            print(f"🔎 프로브: 시가총액 상위 {len(probe_codes)}개 종목 먼저 확인...", flush=True)
+            report.start("probe")
+            probe_data = scraper.scrape(probe_codes)
+            report.end("probe", codes=len(probe_codes), found=len(probe_data))
+            supply_data += probe_data
+            # 네트워크 오류로 못 받은 경우는 미발표로 단정하지 않음 (페이지를 받아서 비어 있을 때만)
+            if not probe_data and scraper.empty_codes:
+                print(f"⏭️ 프로브 종목 모두 오늘({self.today_str}) 행이 없습니다. 대량 수집 생략 "
+                      f"({len(codes)}개 요청 절약)", flush=True)
+                report.incr("naver.avoided_requests", len(codes))
+                report.set("probe_skipped", True)
+                codes = []
+
+        # 4-2. 수급 채굴 (thread: 멀티스레딩 / async: 커넥션 풀 비동기)
+        print(f"🕵️ 종목별 수급 데이터 채굴 중... ({len(codes)}개, 엔진: {args.engine})", flush=True)
+        supply_data += scraper.scrape(codes)
+
+        store.flush()
+        scraper.finish()
+        # 마감으로 못 받은 종목(시가총액 작은 쪽)은 다음 --resume 때 이것만 수집
+        unscraped = [c for c in codes if c not in scraper.attempted] if self.deadline else []
+        store.save_tail(self.target_date, unscraped)
+        if unscraped:
+            report.set("unscraped", {"count": len(unscraped), "codes": unscraped})
+            print(f"\n⏰ 시간 예산 안에 못 받은 종목 {len(unscraped)}개 → 체크포인트에 기록 (다음 실행에서 --resume)",
+                  flush=True)
+        report.end("scrape", codes=len(codes), found=len(supply_data) - naver_before,
+                   empty=len(scraper.empty_codes), unscraped=len(unscraped))
+        self.empty_codes = sorted(scraper.empty_codes)
+        # 샤드는 기록하지 않고 샤드 파일에 넘김 (merge가 전체 결과로 한 번에 기록)
+        if not args.shard:
+            self.record_negative(negative, supply_data)
+        negative.close()
+        return supply_data
+
+    def record_negative(self, negative, supply_data):
+        # 오늘 수급이 하나도 없으면 미발표라서 종목별 '빈 페이지'로 치지 않음
+        if supply_data:
+            negative.record(self.target_date, self.empty_codes, [r['Code'] for r in supply_data])
+
+    def reparse_archive(self, source):
+        """재처리 모드: 네트워크 없이 아카이브의 일괄 수급 + 페이지 원본을 다시 파싱."""
+        from .naver_parser import parse_supply_row
+        from .raw_archive import PAGE_PREFIX
+        from .supply import to_record
+
+        self.report.start("reprocess_parse")
+        supply_data = source.load_bulk()
+        bulk_codes = {r['Code'] for r in supply_data}
+        pages = [c for c in source.page_codes() if c not in bulk_codes]
+        for code in pages:
+            start = time.perf_counter()
+            row = parse_supply_row(source.get(PAGE_PREFIX + code), self.today_str)
+            self.report.record_parse(time.perf_counter() - start)
+            if row: supply_data.append(to_record(code, row))
+        self.report.end("reprocess_parse", bulk=len(bulk_codes), pages=len(pages),
+                        found=len(supply_data) - len(bulk_codes))
+        print(f"🗄️ [재처리] 일괄 {len(bulk_codes)}개 + 페이지 {len(pages)}개 파싱 → 수급 {len(supply_data)}개",
+              flush=True)
+        return supply_data
+
+    # --- 5~6. 병합 / 저장 ---
+    def merge_and_save(self, df_krx, supply_data):
+        from .derived_metrics import add_volume_metrics, previous_volume
+        from .result_builder import build_result
+
+        print(f"\n✅ 수집 완료! {len(supply_data)}개 종목 수급 확보.", flush=True)
+        for controller in rate_control.all_controllers():
+            print(f"⚙️ {controller.summary()}", flush=True)
+
+        # 5. 데이터 병합 (★핵심 수정: 수급 없어도 죽지 않기★)
+        print("🔧 데이터 병합 중...", flush=True)
+        self.report.start("merge")
+        result_df, df_supply = build_result(df_krx, supply_data, self.target_date)
+        self.report.end("merge", rows=len(result_df), supply_rows=len(df_supply))
+
+        # 5-1. 파생 지표: 직전 거래일 거래량을 한 번에 읽어 전일거래량 / 거래량비율 채우기
+        self.report.start("derived")
+        prev_date, df_prev, prev_source = previous_volume(self.engine() if self.has_db() else None,
+                                                          self.target_date, self.store)
+        matched = add_volume_metrics(result_df, df_prev)
+        self.report.end("derived", prev_date=prev_date, source=prev_source, matched=matched)
+        if prev_date:
+            print(f"📈 전일거래량: {prev_date} 기준 {matched}/{len(result_df)}종목 ({prev_source})", flush=True)
+        else:
+            print("⚠️ 직전 거래일 데이터가 없어 전일거래량을 0으로 둡니다.", flush=True)
+        print(f"📊 저장 대상: {len(result_df)}건 (수급 데이터 유무와 상관없이 저장)", flush=True)
+
+        # 6. DB 저장 (실패해도 체크포인트에 남아 --resume / write 로 재시도 가능)
+        self.store.save_result(self.target_date, result_df)
+        self.save_snapshot(result_df)
+        self.save_to_db(result_df)
+        return result_df
+
+    # --- 샤드 ---
+    def save_shard(self, df_krx, supply_data):
+        """샤드 모드: DB 대신 샤드 결과 파일만 남긴다 (merge가 모아서 한 번에 저장)."""
+        from .shards import write_shard
+
+        index, shards = self.args.shard
+        stats = {"scrape": self.report.stages.get("scrape", {}), "listing": self.report.stages.get("listing", {})}
+        path = write_shard(self.args.shard_dir, self.target_date, index, shards, df_krx, supply_data, stats,
+                           empty_codes=self.empty_codes)
+        self.report.set("shard", {"index": index, "shards": shards, "codes": len(df_krx),
+                                  "supply": len(supply_data), "path": path})
+        print(f"\n🧩 샤드 {index}/{shards} 저장: 종목 {len(df_krx)}개 / 수급 {len(supply_data)}개 → {path}", flush=True)
+
+    def merge_shards(self, shards=None):
+        from .negative_cache import NegativeCache
+        from .shards import load_shards
+
+        self.report.start("shard_merge")
+        df_krx, supply_data, self.empty_codes, stats = load_shards(self.args.shard_dir, self.target_date, shards)
+        self.report.end("shard_merge", shards=len(stats), codes=len(df_krx), supply=len(supply_data),
+                        empty=len(self.empty_codes))
+        negative = NegativeCache(self.args.negative_cache, ttl_days=self.args.negative_ttl)
+        self.record_negative(negative, supply_data)
+        negative.close()
+        self.report.set("shards", stats)
+        print(f"🧩 샤드 {len(stats)}개 병합: 종목 {len(df_krx)}개 / 수급 {len(supply_data)}개", flush=True)
+        self.merge_and_save(df_krx, supply_data)
+        return 0
+
+    def run_local_shards(self):
+        """--local-shards N: 종목 리스트는 한 번만 받고, 샤드 N개를 하위 프로세스로 돌린 뒤 병합."""
+        import subprocess
+        import sys
+
+        from .shards import shard_label, shard_path
+
+        args = self.args
+        shards = args.local_shards
+        df_krx = self.load_listing()
+        # 하위 프로세스는 이 CSV를 종목 리스트로 씀 (N개가 각자 FDR/pykrx를 부르지 않도록)
+        os.makedirs(args.shard_dir, exist_ok=True)
+        listing_path = os.path.abspath(os.path.join(args.shard_dir, f"{self.target_date}.listing.csv"))
+        df_krx.to_csv(listing_path, index=False)
+        package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, LISTING_URL=listing_path,
+                   PYTHONPATH=os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")])))
+
+        # 원래 인자 + 샤드별 파일 경로 (뒤에 준 옵션이 우선). SQLite 파일은 샤드마다 따로 씀
+        base_argv = strip_option(args.argv, "--local-shards")
+        procs = []
+        print(f"🧩 로컬 샤드 {shards}개 실행 (종목 {len(df_krx)}개, 로그: {args.shard_dir}/)", flush=True)
+        for index in range(shards):
+            argv = base_argv + [
+                "--shard", f"{index}/{shards}", "--date", self.target_date,
+                "--checkpoint", shard_path(args.checkpoint, index, shards),
+                "--report", shard_path(args.report, index, shards),
+                "--universe-cache", os.path.join(args.shard_dir, f"universe.{shard_label(index, shards)}.db"),
+            ]
+            log_path = os.path.join(args.shard_dir, f"{self.target_date}.{shard_label(index, shards)}.log")
+            log = open(log_path, "w", encoding="utf-8")
+            proc = subprocess.Popen([sys.executable, "-m", "stock_scraper"] + argv, env=env,
+                                    stdout=log, stderr=subprocess.STDOUT)
+            procs.append((index, proc, log, log_path))
+
+        failed = []
+        for index, proc, log, log_path in procs:
+            code = proc.wait()
+            log.close()
+            print(f"   {'✅' if code == 0 else '❌'} 샤드 {index}/{shards} 종료 (코드 {code}, {log_path})",
+                  flush=True)
+            if code != 0:
+                failed.append(index)
+        self.report.set("local_shards", {"shards": shards, "failed": failed})
+        if failed:
+            raise JobFailed(f"샤드 {failed} 실패 → 로그 확인 후 해당 샤드만 다시 돌리고 merge 하세요.")
+        return self.merge_shards(shards)
+
+    # --- 서브커맨드 ---
+    def run_scrape(self):
+        args = self.args
+        self.banner()
+        if args.resume and not args.shard and self.write_pending():
+            return 0
+        if args.local_shards:
+            return self.run_local_shards()
+        archive = None
+        if args.archive:
+            # 원본 응답 아카이브 (--archive). 샤드는 각자 하위 폴더에 씀
+            from .raw_archive import RawArchive
+            directory = args.archive
+            if args.shard:
+                from .shards import shard_label
+                directory = os.path.join(directory, shard_label(*args.shard))
+            archive = RawArchive(directory, self.target_date)
+        df_krx = self.load_listing()
+        if args.shard:
+            from .shards import select_shard
+            total = len(df_krx)
+            df_krx = select_shard(df_krx, *args.shard)
+            print(f"🧩 샤드 {args.shard[0]}/{args.shard[1]}: 전체 {total}개 중 {len(df_krx)}개 담당", flush=True)
+        if archive: archive.put_listing(df_krx)
+        supply_data = self.collect_supply(df_krx, archive)
+        if args.shard:
+            self.save_shard(df_krx, supply_data)
+        else:
+            self.merge_and_save(df_krx, supply_data)
+        return 0
+
+    def run_merge(self):
+        self.banner()
+        return self.merge_shards(self.args.shards)
+
+    def run_reprocess(self):
+        from .raw_archive import DEFAULT_ARCHIVE_DIR, open_archive
+
+        self.banner()
+        source = open_archive(self.args.archive or DEFAULT_ARCHIVE_DIR, self.target_date)
+        df_krx = self.load_listing(source)
+        self.merge_and_save(df_krx, self.reparse_archive(source))
+        return 0
+
+    def run_write(self):
+        if not self.write_pending():
+            print(f"ℹ️ {self.target_date}: DB에 쓸 결과가 체크포인트에 없습니다 (이미 저장됐거나 수집 전).", flush=True)
+        return 0
+
+    def run_backfill(self):
+        """기간 수급 이력만 모아서 저장 (가격 컬럼은 건드리지 않음)."""
+        from .backfill import backfill_supply
+        from .db_writer import write_result
+
+        args = self.args
+        self.banner()
+        df_krx = self.load_listing()
+        date_to = args.date_to or self.target_date
+        print(f"⏪ 수급 백필: {args.date_from} ~ {date_to} ({len(df_krx)}개 종목)", flush=True)
+        self.report.start("backfill")
+        df_back = backfill_supply(df_krx['Code'].tolist(), args.date_from, date_to,
+                                  limiter=self.naver_rate, per_host=args.per_host)
+        self.report.end("backfill", rows=len(df_back))
+        print(f"⚙️ {self.naver_rate.summary()}", flush=True)
+        if df_back.empty:
+            print("⚠️ 백필할 수급 데이터가 없습니다.", flush=True)
+            return 0
+        # 종목명/구분/업종명은 현재 리스트 기준 (가격 컬럼은 건드리지 않음)
+        names = df_krx.reindex(columns=['Code', 'Name', 'Market', 'Sector']).rename(
+            columns={'Code': 'Symbol', 'Name': '종목명', 'Market': '구분', 'Sector': '업종명'})
+        df_back = df_back.merge(names, on='Symbol', how='left')
+        df_back['업종명'] = df_back['업종명'].fillna('')
+        print(f"📊 백필 대상: {len(df_back)}건 / {df_back['날짜'].nunique()}일", flush=True)
+        self.report.start("db_write")
+        try:
+            write_result(self.engine(), df_back, batch_size=args.batch_size, partial=True)
+            self.report.end("db_write", ok=True)
+            print(f"\n✅ [완전 성공] 백필 저장 완료! ({args.date_from} ~ {date_to})", flush=True)
+        except Exception as e:
+            self.report.end("db_write", ok=False, error=str(e))
+            raise JobFailed(f"백필 저장 실패: {e}") from e
+        if not args.no_aggregates:
+            self.refresh_aggregates(df_back['날짜'].unique().tolist())
+        return 0
+
+    def refresh_aggregates(self, dates):
+        # 과거 순매수가 바뀌었으니 그 날짜들의 업종/시장 집계와 이후 누적도 다시 계산
+        from .aggregates import refresh_dates
+
+        self.report.start("aggregates")
+        try:
+            summary = refresh_dates(self.engine(), dates)
+            self.report.end("aggregates", ok=True, **summary)
+            print(f"🧮 업종/시장 집계 {summary['dates']}일 재계산 (그룹 {summary['groups']}개, "
+                  f"누적 {summary['rebuilt']}행, {summary['sec']:.2f}초)", flush=True)
+        except Exception as e:
+            self.report.end("aggregates", ok=False, error=str(e))
+            print(f"⚠️ 업종/시장 집계 재계산 실패: {e}", flush=True)
+
+    def run_daemon(self):
+        """상주 모드: 세션/엔진/유니버스를 유지한 채 내부 스케줄러로 반복 (collector_daemon.py)."""
+        from .collector_daemon import IntradayCollector, run_daemon
+        from .hedging import Hedger
+        from .negative_cache import NegativeCache
+
+        args = self.args
+        self.banner()
+        hedger = Hedger(args.hedge_pct, args.hedge_rate) if args.hedge_pct > 0 else None
+        collector = IntradayCollector(
+            self.target_date, self.engine(), self.store, self.naver_rate, self.krx_rate, self.universe(),
+            negative=None if args.no_prefilter else NegativeCache(args.negative_cache, ttl_days=args.negative_ttl),
+            listing_url=self.listing_url or None, close_time=args.close_time, final_after=args.final_after,
+            probe=args.probe, hedger=hedger, per_host=args.per_host, batch_size=args.batch_size,
+            aggregates=not args.no_aggregates, bulk=args.supply_source == "bulk")
+        done = run_daemon(collector, interval_min=args.interval, until=args.until)
+        self.report.set("daemon", {"ticks": collector.ticks, "final": len(collector.final),
+                                   "codes": len(collector.codes or []), "done": done})
+        return 0
+
+
+def strip_option(argv, option):
+    """argv에서 option(값 포함, --opt N / --opt=N 둘 다)을 뺀다."""
+    result, skip = [], False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg == option:
+            skip = True
+        elif not arg.startswith(option + "="):
+            result.append(arg)
+    return result
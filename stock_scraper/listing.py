@@ -0,0 +1,133 @@
+import time
+
+import pandas as pd
+
+from . import JobFailed
+from .universe_cache import fetch_listing_pykrx, fetch_prices_bulk, refresh_prices, static_part
+
+# ---------------------------------------------------------
+# KRX 전체 종목 리스트 (가격/거래량 포함)
+# 유니버스 캐시(가격만 갱신) -> FDR -> pykrx -> 마지막 정상 스냅샷 -> KIND HTML 순서로 시도
+# FinanceDataReader는 캐시가 없거나 만료됐을 때만 불러온다 (임포트만 1초 가까이 걸림).
+# ---------------------------------------------------------
+MAX_RETRIES = 5
+KIND_URL = "https://kind.krx.co.kr/corpgeneral/corpList.do?method=download&searchType=13"
+PING_URL = "https://raw.githubusercontent.com/FinanceData/FinanceDataReader/master/README.md"
+
+
+def ping_fdr():
+    # FDR이 계속 실패할 때만: 네트워크 차단인지 확인
+    import requests
+
+    try:
+        resp = requests.get(PING_URL, timeout=5)
+        print("FDR endpoint reachable (HTTP", resp.status_code, ")", flush=True)
+    except Exception as ping_err:
+        print("FDR ping failed:", ping_err, flush=True)
+
+
+def fetch_listing_fdr(universe, krx_rate, listing_url=None):
+    """FDR(또는 LISTING_URL CSV) 리스트. 모두 실패하면 None."""
+    if not listing_url:
+        import FinanceDataReader as fdr
+        # debug 정보: FDR 버전
+        print("FinanceDataReader version:", getattr(fdr, "__version__", "?"), flush=True)
+
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            print(f"running fdr... (시도 {attempt}/{MAX_RETRIES})")
+
+            if listing_url:
+                df_krx = pd.read_csv(listing_url, dtype={'Code': str})
+            else:
+                # 직접 파라미터를 바꾸지 않고 정상 호출만 수행
+                df_krx = fdr.StockListing('KRX')
+
+            if df_krx is None or df_krx.empty:
+                sleep_time = krx_rate.backoff(attempt)
+                print(f"⚠️ FDR 응답이 비어있습니다. {sleep_time:.1f}초 후 재시도...")
+                time.sleep(sleep_time)
+                continue
+
+            df_krx = df_krx.dropna(subset=['Name'])
+            df_krx['Code'] = df_krx['Code'].astype(str)
+            print(f"✅ KRX 종목 리스트 확보: {len(df_krx)}개 (가격 데이터 확보)", flush=True)
+            universe.save(df_krx)
+            return df_krx
+
+        except Exception as e:
+            error_msg = str(e)
+            print(f"❌ FDR 시도 {attempt} 실패: {error_msg}", flush=True)
+            print(f"   상세 에러: {type(e).__name__}", flush=True)
+            # 혹시 응답 본문이 있으면 로그에 같이 남기기
+            if hasattr(e, 'response') and getattr(e.response, 'text', None):
+                print("   응답 본문:", e.response.text[:200], flush=True)
+            if attempt < MAX_RETRIES:
+                sleep_time = krx_rate.backoff(attempt)
+                print(f"   {sleep_time:.1f}초 후 재시도...", flush=True)
+                time.sleep(sleep_time)
+            else:
+                print("⚠️ 모든 시도가 실패했습니다. pykrx 대체 경로를 시도합니다.", flush=True)
+                if not listing_url:
+                    ping_fdr()
+    return None
+
+
+def fetch_listing_kind():
+    """KRX corpList 다운로드 페이지 (종목코드/종목명만, 가격 없음)."""
+    df_temp = pd.read_html(KIND_URL)[0]
+    # 표 형식: 종목코드, 종목명, 상장일, 결산월, 업종, 주식수 등
+    df_temp.columns = [c.strip() for c in df_temp.columns]
+    df_krx = pd.DataFrame({'Code': df_temp['종목코드'].astype(str).str.zfill(6),
+                           'Name': df_temp['종목명']})
+    df_krx['Market'] = ''
+    df_krx['Sector'] = ''
+    return df_krx
+
+
+def load_listing(target_date, universe, krx_rate, listing_url=None):
+    """(df_krx, 출처). 모든 경로가 실패하면 JobFailed."""
+    # 2-0. 유니버스 캐시: TTL 안이면 정적 컬럼(코드/종목명/시장/업종)은 캐시, 가격만 pykrx 일괄 조회로 갱신
+    cached_df, cached_age = universe.load()
+    if universe.is_fresh(cached_age) and not listing_url:
+        print(f"🗂️ 유니버스 캐시 사용 ({cached_age:.1f}시간 전, {len(cached_df)}개) → 가격 컬럼만 갱신", flush=True)
+        df_krx = refresh_prices(cached_df, fetch_prices_bulk(target_date, krx_rate))
+        if df_krx is not None:
+            print(f"✅ 캐시 + 가격 갱신으로 {len(df_krx)}개 종목 확보", flush=True)
+            return df_krx, "cache"
+        print("⚠️ 가격 갱신 실패 → 전체 리스트를 다시 받습니다.", flush=True)
+
+    # 2. KRX 전체 종목 리스트 (FDR) - 가격/거래량 정보는 여기서 옴
+    df_krx = fetch_listing_fdr(universe, krx_rate, listing_url)
+    if df_krx is not None and not df_krx.empty:
+        return df_krx, "fdr"
+
+    # FDR가 실패하거나 빈 데이터일 경우 pykrx로 fallback
+    try:
+        print("🔁 pykrx로 종목 코드 가져오기... (종목명/가격 일괄 조회)", flush=True)
+        df_krx = fetch_listing_pykrx(target_date, krx_rate)
+        if df_krx.empty:
+            raise ValueError("pykrx로도 종목 리스트를 가져오지 못했습니다.")
+        print(f"✅ pykrx로 {len(df_krx)}개 종목 확보", flush=True)
+        return df_krx, "pykrx"
+    except Exception as py_err:
+        print(f"⚠️ pykrx 실패: {py_err}", flush=True)
+
+    # 마지막 정상 스냅샷 (가격 없이 종목 구성만)
+    if cached_df is not None:
+        df_krx = static_part(cached_df)
+        print(f"🗂️ 마지막 정상 유니버스 캐시 사용 ({cached_age:.1f}시간 전, {len(df_krx)}개, 가격은 0)", flush=True)
+        return df_krx, "last_known_good"
+
+    # HTML 스크래핑 시도 (KRX corpList 다운로드 페이지)
+    try:
+        print("🔁 pandas로 KRX 다운로드 페이지 스크래핑...", flush=True)
+        df_krx = fetch_listing_kind()
+        if df_krx.empty:
+            raise ValueError("스크래핑 결과가 비어있음")
+        print(f"✅ HTML 스크래핑으로 {len(df_krx)}개 종목 확보", flush=True)
+        return df_krx, "kind_html"
+    except Exception as html_err:
+        print(f"⚠️ HTML 스크래핑 실패: {html_err}", flush=True)
+
+    raise JobFailed("FDR/pykrx/HTML 스크래핑 모두 실패했습니다. 네트워크 또는 API 변경을 확인하세요.")
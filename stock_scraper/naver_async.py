@@ -0,0 +1,212 @@
+import asyncio
+import time
+
+import aiohttp
+
+from .hedging import hedged_async
+from .naver_stream import ACCEPT_ENCODING, CHUNK_SIZE, SupplyStream
+from .naver_urls import HEADERS, NAVER_FRGN_URL
+from .rate_control import ERROR, OK, get_controller, status_of
+from .run_report import get_report
+
+# ---------------------------------------------------------
+# 네이버 금융 비동기 수집 엔진 (keep-alive 커넥션 풀)
+# - 스레드 20개 + 매번 새 TCP/TLS 핸드셰이크 대신
+#   하나의 ClientSession 커넥션 풀을 재사용한다.
+# - 동시 요청 수는 RateController(AIMD)가 응답 상태/지연을 보고 조절한다.
+# ---------------------------------------------------------
+
+
+def make_session(concurrency, per_host, timeout, auto_decompress=True):
+    connector = aiohttp.TCPConnector(
+        limit=concurrency,
+        limit_per_host=per_host,
+        keepalive_timeout=30,
+        ttl_dns_cache=300,
+    )
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    headers = HEADERS if auto_decompress else {**HEADERS, "Accept-Encoding": ACCEPT_ENCODING}
+    return aiohttp.ClientSession(connector=connector, headers=headers, timeout=client_timeout,
+                                 auto_decompress=auto_decompress)
+
+
+async def _read_text(res):
+    body = await res.read()
+    return await res.text(), len(body)
+
+
+def stream_reader(target_date, keep=False):
+    """조기 중단 스트리밍 읽기 (auto_decompress=False 세션용). SupplyStream을 돌려준다."""
+    async def read(res):
+        stream = SupplyStream(target_date, res.charset, res.headers.get("Content-Encoding"), keep=keep)
+        async for chunk in res.content.iter_chunked(CHUNK_SIZE):
+            if stream.feed(chunk):
+                break
+        return stream, stream.wire_bytes
+    return read
+
+
+async def _attempt(session, limiter, url, attempt, hedger=None, on_start=None, read=_read_text):
+    """요청 1회. (status, read(res) 결과 또는 None)"""
+    await limiter.acquire_async()
+    if on_start:
+        on_start()
+    start = time.monotonic()
+    status, error, nbytes, text = ERROR, None, 0, None
+    try:
+        async with session.get(url) as res:
+            if res.status >= 400:
+                status, error = status_of(res.status), f"HTTP {res.status}"
+            else:
+                text, nbytes = await read(res)
+                status = OK
+    except asyncio.CancelledError:
+        # 헤지에서 졌거나 마감으로 취소됨 -> 성공/실패로 세지 않고 슬롯만 반납
+        limiter.abandon()
+        raise
+    except asyncio.TimeoutError:
+        error = "Timeout"
+    except Exception as e:
+        error = type(e).__name__
+
+    latency = time.monotonic() - start
+    limiter.release(latency, status, error)
+    get_report().record_request(limiter.name, latency, nbytes, attempt, status)
+    if hedger is not None and status == OK:
+        hedger.record(latency)
+    return status, text
+
+
+async def fetch_text(session, limiter, url, retries, hedger=None, read=_read_text):
+    """url 본문을 가져온다. 재시도까지 모두 실패하면 None.
+
+    hedger: Hedger를 주면 느린 요청에 같은 요청을 하나 더 보내 먼저 온 쪽을 씀
+    read: 응답 읽기 방식 (기본: 본문 전체 텍스트, stream_reader: 스트리밍 파싱)
+    """
+    for attempt in range(retries):
+        if hedger is None:
+            status, text = await _attempt(session, limiter, url, attempt, read=read)
+        else:
+            status, text = await hedged_async(
+                hedger, lambda on_start: _attempt(session, limiter, url, attempt, hedger, on_start, read))
+        if status == OK:
+            return text
+
+        if attempt < retries - 1:
+            await asyncio.sleep(limiter.backoff(attempt))
+
+    return None
+
+
+async def _fetch_one(session, limiter, code, parse, retries, pipeline=None, slots=None, hedger=None,
+                     read=_read_text, on_page=None):
+    if pipeline is not None:
+        # 파서 대기 HTML이 queue_size개면 새로 받지 않고 기다림 (backpressure)
+        async with slots:
+            with pipeline.stage("fetch"):
+                html = await fetch_text(session, limiter, NAVER_FRGN_URL.format(code=code), retries, hedger)
+            if html is None:
+                return None
+            if on_page: on_page(code, html)
+            return await pipeline.parse_async(code, html)
+
+    html = await fetch_text(session, limiter, NAVER_FRGN_URL.format(code=code), retries, hedger, read)
+    if html is None:
+        return None
+    if on_page: on_page(code, html)
+    # 페이지는 받았는데 오늘 행이 없으면 재시도해도 결과가 같으므로 바로 종료
+    try:
+        return parse(code, html)
+    except Exception:
+        return None
+
+
+async def _fetch_all(codes, parse, limiter, per_host, timeout, retries, on_result, deadline, pipeline, hedger,
+                     stream_date, on_page):
+    async with make_session(limiter.max_limit, per_host or limiter.max_limit, timeout,
+                            auto_decompress=not stream_date) as session:
+        return await _fetch_with(session, codes, parse, limiter, retries, on_result, deadline, pipeline, hedger,
+                                 stream_date, on_page)
+
+
+async def _fetch_with(session, codes, parse, limiter, retries, on_result=None, deadline=None, pipeline=None,
+                      hedger=None, stream_date=None, on_page=None):
+    supply_data = []
+    slots = asyncio.Semaphore(pipeline.queue_size) if pipeline else None
+    read = stream_reader(stream_date, keep=on_page is not None) if stream_date else _read_text
+    tasks = {
+        asyncio.ensure_future(
+            _fetch_one(session, limiter, code, parse, retries, pipeline, slots, hedger, read, on_page)): code
+        for code in codes
+    }
+    completed = 0
+    total = len(codes)
+    pending = set(tasks)
+    while pending:
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+        if not done and pending:
+            # 마감: 남은 작업(대기/진행 중)은 취소, on_result도 부르지 않음
+            print(f"\n⏰ 시간 예산 도달 → 남은 {len(pending)}개 취소", flush=True)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            break
+        for task in done:
+            try:
+                result = task.result()
+            except Exception as e:
+                print(f"⚠️ [{tasks[task]}] 파싱 실패: {e}", flush=True)
+                result = None
+            if result: supply_data.append(result)
+            if on_result: on_result(tasks[task], result)
+            completed += 1
+            if completed % 100 == 0:
+                print(f"   👉 진행률: {completed}/{total}", end="\r")
+
+    return supply_data
+
+
+class WarmFetcher:
+    """데몬용: 이벤트 루프 하나와 ClientSession(keep-alive 풀)을 계속 유지하고 틱마다 재사용.
+
+    fetch_supply는 호출마다 asyncio.run + 새 세션이라 연결/TLS 핸드셰이크를 다시 한다.
+    """
+
+    def __init__(self, limiter=None, per_host=None, timeout=5, retries=3, hedger=None):
+        self.limiter = limiter or get_controller("naver")
+        self.retries = retries
+        self.hedger = hedger
+        self.loop = asyncio.new_event_loop()
+        self.session = self.loop.run_until_complete(self._open(per_host or self.limiter.max_limit, timeout))
+
+    async def _open(self, per_host, timeout):
+        return make_session(self.limiter.max_limit, per_host, timeout)
+
+    def fetch(self, codes, parse, on_result=None, deadline=None):
+        return self.loop.run_until_complete(_fetch_with(self.session, codes, parse, self.limiter, self.retries,
+                                                        on_result, deadline, hedger=self.hedger))
+
+    def close(self):
+        self.loop.run_until_complete(self.session.close())
+        self.loop.close()
+
+
+def fetch_supply(codes, parse, limiter=None, per_host=None, timeout=5, retries=3, on_result=None,
+                 deadline=None, pipeline=None, hedger=None, stream_date=None,
+                 on_page=None):
+    """codes 전체를 비동기로 수집해서 parse(code, html) 결과 리스트를 돌려준다.
+
+    limiter: 동시 요청 수를 조절하는 RateController (기본: 공유 "naver" 제어기)
+             커넥션 풀 크기는 limiter.max_limit
+    per_host: 호스트당 최대 커넥션 수 (기본: limiter.max_limit)
+    on_result: 종목 하나가 끝날 때마다 (code, result)로 호출되는 콜백
+    deadline: time.monotonic() 기준 마감 시각. 넘으면 남은 종목은 취소하고 받은 것만 돌려줌
+    pipeline: ParsePipeline을 주면 parse 대신 프로세스 풀 파서가 파싱 (parse_pipeline.py)
+    hedger: Hedger를 주면 느린 요청에 헤지 요청을 보냄 (hedging.py)
+    stream_date: 주면 스트리밍 조기 중단 모드. parse(code, SupplyStream)으로 호출 (naver_stream.py)
+    on_page: 페이지를 받을 때마다 파싱 전에 (code, 본문 또는 SupplyStream)으로 호출 (원본 아카이브용)
+    """
+    limiter = limiter or get_controller("naver")
+    return asyncio.run(_fetch_all(codes, parse, limiter, per_host, timeout, retries, on_result, deadline,
+                                  pipeline, hedger, stream_date, on_page))
@@ -0,0 +1,103 @@
+from lxml import etree
+
+# ---------------------------------------------------------
+# frgn.naver 전용 파서
+# - pd.read_html 처럼 모든 type2 표를 DataFrame으로 만들지 않고
+#   두 번째 type2 표(외국인·기관 순매매)의 날짜/기관/외국인 칸만 읽는다.
+# - target_date를 주면 그 날짜 행(또는 더 과거 행)을 만나는 순간 멈춘다.
+# ---------------------------------------------------------
+# 표 구조: 날짜 | 종가 | 전일비 | 등락률 | 거래량 | 기관 순매매량 | 외국인 순매매량 | 보유주수 | 보유율
+DATE_COL = 0
+AGENCY_COL = 5
+FOREIGN_COL = 6
+TARGET_TABLE_NO = 2
+
+
+def _cell_text(td):
+    return "".join(td.itertext()).strip()
+
+
+def _to_int(text):
+    return int(text.replace(",", "").replace("+", ""))
+
+
+def _parse_row(tr):
+    tds = tr.findall("td")
+    if len(tds) <= FOREIGN_COL:
+        return None
+    date = _cell_text(tds[DATE_COL])
+    if not date:
+        return None
+    try:
+        return date, _to_int(_cell_text(tds[FOREIGN_COL])), _to_int(_cell_text(tds[AGENCY_COL]))
+    except ValueError:
+        return None
+
+
+class FrgnTableParser:
+    """feed()로 HTML을 조금씩 넣으면 (날짜, 외국인, 기관) 행을 모아주는 증분 파서."""
+
+    def __init__(self, target_date=None, encoding=None):
+        self.target_date = target_date
+        self.rows = []
+        self.done = False
+        self._parser = etree.HTMLPullParser(events=("start", "end"), tag=("table", "tr"), encoding=encoding)
+        self._table_no = 0
+        self._in_target = False
+
+    def feed(self, data):
+        if self.done:
+            return True
+        self._parser.feed(data)
+        for event, el in self._parser.read_events():
+            if el.tag == "table":
+                if event == "start" and "type2" in (el.get("class") or "").split():
+                    self._table_no += 1
+                    self._in_target = self._table_no == TARGET_TABLE_NO
+                elif event == "end" and self._in_target:
+                    self._in_target = False
+                    self.done = True
+            elif event == "end" and self._in_target:
+                row = _parse_row(el)
+                el.clear()
+                if row is not None:
+                    self._add(row)
+            if self.done:
+                break
+        return self.done
+
+    def _add(self, row):
+        if self.target_date is None:
+            self.rows.append(row)
+        elif row[0] == self.target_date:
+            self.rows.append(row)
+            self.done = True
+        elif row[0] < self.target_date:
+            # 최신순 정렬이라 더 과거 행이 나오면 오늘 행은 없는 것
+            self.done = True
+
+    def close(self):
+        if not self.done:
+            try:
+                self._parser.close()
+            except etree.XMLSyntaxError:
+                pass
+        return self.rows
+
+
+def parse_supply_rows(html):
+    """페이지 안의 모든 (날짜, 외국인, 기관) 행을 최신순으로 돌려준다."""
+    parser = FrgnTableParser()
+    parser.feed(html)
+    return parser.close()
+
+
+def parse_supply_row(html, target_date):
+    """target_date('YYYY.MM.DD') 행의 (외국인, 기관) 순매매량. 없으면 None."""
+    parser = FrgnTableParser(target_date)
+    parser.feed(html)
+    rows = parser.close()
+    if not rows:
+        return None
+    _, foreign, agency = rows[0]
+    return foreign, agency
@@ -0,0 +1,64 @@
+import time
+import zlib
+
+from .naver_parser import FrgnTableParser
+
+# ---------------------------------------------------------
+# frgn.naver 스트리밍 파싱 (조기 중단)
+# - 압축(gzip/deflate) 전송을 받아 조각마다 직접 풀면서 증분 파서에 넣고
+#   target_date 행(또는 그보다 과거 행)을 보는 순간 다운로드를 끊는다.
+# - 실제로 읽은 전송 바이트(wire, 압축 상태)와 푼 바이트(body)를 직접 센다.
+#   chunked 응답은 Content-Length가 없어서 끊어서 아낀 양은 알 수 없으므로 세지 않는다.
+# - 끊은 연결은 keep-alive로 재사용되지 않는다 (다음 요청은 새 연결).
+# ---------------------------------------------------------
+CHUNK_SIZE = 2048
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+def charset_of(content_type):
+    """Content-Type 헤더의 charset (없으면 None -> lxml이 meta 태그로 판단)."""
+    for part in (content_type or "").split(";")[1:]:
+        key, _, value = part.strip().partition("=")
+        if key.lower() == "charset" and value:
+            return value.strip('"')
+    return None
+
+
+class SupplyStream:
+    def __init__(self, target_date, charset=None, content_encoding=None, keep=False):
+        """keep: 푼 본문을 모아 둠 (원본 아카이브용, 끊은 지점까지만)."""
+        encoding = (content_encoding or "").lower()
+        # wbits 32+: gzip / zlib 헤더 자동 판별
+        self._decomp = zlib.decompressobj(32 + zlib.MAX_WBITS) if encoding in ("gzip", "deflate") else None
+        self.parser = FrgnTableParser(target_date, encoding=charset)
+        self.wire_bytes = 0
+        self.body_bytes = 0
+        self.parse_sec = 0.0
+        self.charset = charset
+        self._kept = [] if keep else None
+
+    def feed(self, chunk):
+        """조각 하나를 넣는다. 더 받을 필요가 없으면 True."""
+        self.wire_bytes += len(chunk)
+        data = self._decomp.decompress(chunk) if self._decomp else chunk
+        if not data:
+            return self.parser.done
+        self.body_bytes += len(data)
+        if self._kept is not None:
+            self._kept.append(data)
+        start = time.perf_counter()
+        done = self.parser.feed(data)
+        self.parse_sec += time.perf_counter() - start
+        return done
+
+    def text(self):
+        """모아 둔 본문 (keep=True일 때). 네이버 금융은 euc-kr."""
+        return b"".join(self._kept or []).decode(self.charset or "euc-kr", errors="replace")
+
+    def row(self):
+        """target_date 행의 (외국인, 기관) 순매매량. 없으면 None."""
+        rows = self.parser.close()
+        if not rows:
+            return None
+        _, foreign, agency = rows[0]
+        return foreign, agency
@@ -0,0 +1,9 @@
+import os
+
+# ---------------------------------------------------------
+# 네이버 금융 주소 / 공통 헤더 (가벼운 모듈: 프로브/CLI가 aiohttp 없이 가져다 씀)
+# NAVER_BASE_URL: 오프라인 벤치마크에서 로컬 대역 서버로 돌릴 때 사용
+# ---------------------------------------------------------
+NAVER_BASE_URL = os.environ.get("NAVER_BASE_URL", "https://finance.naver.com").rstrip("/")
+NAVER_FRGN_URL = NAVER_BASE_URL + "/item/frgn.naver?code={code}"
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
@@ -0,0 +1,63 @@
+import sqlite3
+import time
+
+# ---------------------------------------------------------
+# 네거티브 캐시 + 사전 필터 (수급 행이 안 나오는 종목 건너뛰기)
+# - 스팩, 거래정지(Volume == 0) 종목은 frgn.naver에 오늘 행이 없으므로 요청하지 않음
+# - 페이지는 정상으로 받았는데 오늘 행이 없던 종목을 날짜별로 세어 두고
+#   min_misses번 이상 연속으로 비면 ttl_days 동안 건너뜀 (만료되면 다시 확인)
+# - 건너뛴 종목은 병합 단계에서 수급 0으로 채워진다.
+# ---------------------------------------------------------
+SPAC_KEYWORD = "스팩"
+
+
+def prefilter(df_krx):
+    """규칙 기반으로 수급 행이 없을 종목 {Code: 사유}."""
+    skipped = {}
+    if "Name" in df_krx.columns:
+        for code in df_krx.loc[df_krx["Name"].astype(str).str.contains(SPAC_KEYWORD), "Code"]:
+            skipped[code] = "spac"
+    # 가격 없이 들어온 리스트(HTML/마지막 스냅샷)는 Volume이 전부 0이라 규칙에서 제외
+    if "Volume" in df_krx.columns and df_krx["Volume"].fillna(0).astype(bool).any():
+        for code in df_krx.loc[df_krx["Volume"].fillna(0) == 0, "Code"]:
+            skipped.setdefault(code, "no_volume")
+    return skipped
+
+
+class NegativeCache:
+    def __init__(self, path, ttl_days=7.0, min_misses=2):
+        self.ttl_days = ttl_days
+        self.min_misses = min_misses
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS misses ("
+            " Code TEXT PRIMARY KEY, misses INTEGER NOT NULL,"
+            " last_date TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def known_empty(self):
+        """아직 만료되지 않은, 수급 행이 없다고 확인된 종목 코드."""
+        rows = self.conn.execute(
+            "SELECT Code FROM misses WHERE misses >= ? AND expires_at > ?",
+            (self.min_misses, time.time()),
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def record(self, date, missed, found):
+        """missed: 페이지는 받았는데 오늘 행이 없던 종목, found: 수급을 확보한 종목."""
+        expires_at = time.time() + self.ttl_days * 86400
+        for code in missed:
+            # 같은 날짜를 여러 번 돌려도 한 번만 센다
+            self.conn.execute(
+                "INSERT INTO misses VALUES (?, 1, ?, ?) "
+                "ON CONFLICT (Code) DO UPDATE SET"
+                " misses = misses + (last_date <> excluded.last_date),"
+                " last_date = excluded.last_date, expires_at = excluded.expires_at",
+                (code, date, expires_at),
+            )
+        self.conn.executemany("DELETE FROM misses WHERE Code = ?", [(code,) for code in found])
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
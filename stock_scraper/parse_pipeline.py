@@ -0,0 +1,118 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import multiprocessing
+import os
+import threading
+import time
+
+from .naver_parser import parse_supply_row
+
+# ---------------------------------------------------------
+# 수집/파싱 분리 파이프라인 (producer / consumer)
+# - I/O 워커(스레드 또는 asyncio)는 HTML만 받아서 넘기고
+#   파싱은 ProcessPoolExecutor 파서가 맡는다 (GIL 경쟁 없이 코어 수만큼 확장)
+# - 받았지만 아직 파싱 안 된 HTML이 queue_size개를 넘으면 I/O 쪽이 대기 (backpressure)
+# - 단계별 깊이(요청 중 / 파서 대기)를 기록해서 어느 쪽이 병목인지 리포트에 남긴다
+# ---------------------------------------------------------
+
+
+def parse_job(code, html, target_date):
+    """파서 프로세스에서 실행. (행, 파싱 시간)"""
+    start = time.perf_counter()
+    row = parse_supply_row(html, target_date)
+    return row, time.perf_counter() - start
+
+
+class DepthGauge:
+    def __init__(self):
+        self.current = 0
+        self.max = 0
+        self._samples = 0
+        self._total = 0
+
+    def change(self, delta):
+        self.current += delta
+        self.max = max(self.max, self.current)
+        self._samples += 1
+        self._total += self.current
+
+    def summary(self):
+        return {"max": self.max, "avg": round(self._total / self._samples, 2) if self._samples else 0}
+
+
+class ParsePipeline:
+    def __init__(self, target_date, finish, workers=None, queue_size=256):
+        """finish(code, row, seconds): 메인 프로세스에서 파싱 결과를 레코드로 바꾸는 함수."""
+        self.target_date = target_date
+        self.finish = finish
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        # parse_job은 임포트 가능한 모듈 함수라 spawn(Windows 기본)에서도 동작한다.
+        # fork가 되는 플랫폼은 워커 시작이 빠른 fork를 쓰고,
+        # 어느 쪽이든 I/O 스레드가 뜨기 전에 워커를 미리 띄워 둔다
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+        self.pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context(method))
+        self.pool.submit(int).result()
+        self.gauges = {"fetch": DepthGauge(), "parse_queue": DepthGauge()}
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        with self._lock:
+            self.gauges[name].change(1)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.gauges[name].change(-1)
+
+    # --- 스레드 엔진 ---
+    def submit(self, code, fetch):
+        """I/O 스레드에서 호출. HTML을 받아 파서에 넘기고, 레코드로 끝나는 Future를 돌려준다.
+
+        받기 실패면 None (Future 아님).
+        """
+        self._slots.acquire()
+        try:
+            with self.stage("fetch"):
+                html = fetch(code)
+        except BaseException:
+            self._slots.release()
+            raise
+        if html is None:
+            self._slots.release()
+            return None
+
+        outer = concurrent.futures.Future()
+        with self._lock:
+            self.gauges["parse_queue"].change(1)
+
+        def done(job):
+            with self._lock:
+                self.gauges["parse_queue"].change(-1)
+            self._slots.release()
+            try:
+                row, seconds = job.result()
+                outer.set_result(self.finish(code, row, seconds))
+            except Exception as e:
+                outer.set_exception(e)
+
+        self.pool.submit(parse_job, code, html, self.target_date).add_done_callback(done)
+        return outer
+
+    # --- asyncio 엔진 ---
+    async def parse_async(self, code, html):
+        loop = asyncio.get_running_loop()
+        with self.stage("parse_queue"):
+            row, seconds = await loop.run_in_executor(self.pool, parse_job, code, html, self.target_date)
+        return self.finish(code, row, seconds)
+
+    def stats(self):
+        return {"workers": self.workers, "queue_size": self.queue_size,
+                **{name: gauge.summary() for name, gauge in self.gauges.items()}}
+
+    def close(self):
+        self.pool.shutdown(wait=True)
@@ -0,0 +1,70 @@
+import concurrent.futures
+import os
+import sqlite3
+from datetime import datetime
+
+from .naver_parser import parse_supply_row
+from .naver_urls import HEADERS, NAVER_FRGN_URL
+
+# ---------------------------------------------------------
+# 수급 발표 확인 (probe 서브커맨드)
+# 시가총액 상위 몇 종목의 frgn 페이지만 받아서 오늘 행이 올라왔는지 본다.
+# pandas / FDR / pykrx / DB 없이 requests + lxml만 쓴다 (스케줄러에서 수집 전에 짧게 돌리는 용도).
+# 종료 코드: 0 발표됨, 2 아직 없음, 1 페이지를 하나도 못 받음
+# ---------------------------------------------------------
+# 유니버스 캐시가 없을 때 쓰는 대형주 (삼성전자, SK하이닉스, LG에너지솔루션, 삼성바이오로직스, 현대차 ...)
+DEFAULT_CODES = ["005930", "000660", "373220", "207940", "005380",
+                 "000270", "068270", "035420", "105560", "005490"]
+PUBLISHED, NOT_YET, FAILED = 0, 2, 1
+
+
+def top_codes(universe_path, n):
+    """유니버스 캐시에서 시가총액 상위 n개 코드. 캐시가 없으면 DEFAULT_CODES."""
+    if os.path.exists(universe_path):
+        try:
+            with sqlite3.connect(universe_path) as conn:
+                rows = conn.execute("SELECT Code FROM universe ORDER BY CAST(Marcap AS REAL) DESC LIMIT ?",
+                                    (n,)).fetchall()
+            if rows:
+                return [str(r[0]).zfill(6) for r in rows]
+        except sqlite3.Error as e:
+            print(f"⚠️ 유니버스 캐시 읽기 실패: {e}", flush=True)
+    return DEFAULT_CODES[:n]
+
+
+def check_code(session, code, today_str, timeout=5):
+    """(code, 수급 행 또는 None). 페이지를 못 받으면 예외."""
+    res = session.get(NAVER_FRGN_URL.format(code=code), headers=HEADERS, timeout=timeout)
+    res.raise_for_status()
+    return code, parse_supply_row(res.text, today_str)
+
+
+def run_probe(args):
+    import requests
+
+    today = datetime.strptime(args.date.replace(".", ""), '%Y%m%d') if args.date else datetime.now()
+    today_str = today.strftime('%Y.%m.%d')
+    codes = args.codes.split(",") if args.codes else top_codes(args.universe_cache, args.count)
+
+    found, failed = [], []
+    with requests.Session() as session, concurrent.futures.ThreadPoolExecutor(max_workers=len(codes)) as pool:
+        futures = {pool.submit(check_code, session, code, today_str): code for code in codes}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                code, row = future.result()
+            except Exception as e:
+                failed.append(futures[future])
+                print(f"❌ {futures[future]}: {type(e).__name__}", flush=True)
+                continue
+            if row:
+                found.append(code)
+                print(f"✅ {code}: 외국인 {row[0]:,} / 기관 {row[1]:,}", flush=True)
+
+    if found:
+        print(f"📢 {today_str} 수급 발표됨 ({len(found)}/{len(codes)}종목)", flush=True)
+        return PUBLISHED
+    if len(failed) == len(codes):
+        print(f"❌ 프로브 페이지를 하나도 받지 못했습니다 ({len(codes)}종목)", flush=True)
+        return FAILED
+    print(f"⏳ {today_str} 수급 아직 없음 ({len(codes) - len(failed)}종목 확인)", flush=True)
+    return NOT_YET
@@ -0,0 +1,195 @@
+import asyncio
+import collections
+import random
+import threading
+import time
+
+from .run_report import get_report
+
+# ---------------------------------------------------------
+# 적응형 동시성/속도 제어기 (AIMD)
+# - 성공이 이어지고 지연이 목표 이하면 동시 요청 수를 1씩 늘리고 (Additive Increase)
+# - HTTP 429/5xx, 타임아웃/에러 비율 증가, 지연 급증이면 절반으로 줄인다 (Multiplicative Decrease)
+# - 재시도 대기는 지수 백오프 + 지터
+# - 스레드(acquire)와 asyncio(acquire_async) 양쪽에서 같은 인스턴스를 쓸 수 있다
+# ---------------------------------------------------------
+OK = "ok"
+THROTTLED = "throttled"  # 429 / 5xx
+ERROR = "error"          # 타임아웃, 연결 오류 등
+
+
+class RateController:
+    def __init__(self, name, initial=20, min_limit=2, max_limit=100,
+                 latency_target=2.0, error_threshold=0.2, window=50,
+                 backoff_base=0.5, backoff_cap=10.0, verbose=True):
+        self.name = name
+        self.limit = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.error_threshold = error_threshold
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.verbose = verbose
+
+        self.in_flight = 0
+        self.decisions = []
+        self.counts = collections.Counter()
+        self.errors = collections.Counter()
+        self._recent = collections.deque(maxlen=window)  # (latency, status)
+        self._streak = 0
+        self._last_decrease = 0.0
+        self._throttled_until = 0.0
+        self._cond = threading.Condition()
+        self._async_waiters = collections.deque()
+
+    # --- 슬롯 확보/반납 ---
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait(0.1)
+            self.in_flight += 1
+
+    async def acquire_async(self):
+        while True:
+            with self._cond:
+                if self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return
+                fut = asyncio.get_running_loop().create_future()
+                self._async_waiters.append(fut)
+            try:
+                await asyncio.wait_for(fut, 0.1)
+            except asyncio.TimeoutError:
+                pass
+
+    def release(self, latency, status=OK, error=None):
+        with self._cond:
+            self.in_flight -= 1
+            self.counts[status] += 1
+            if error:
+                self.errors[error] += 1
+            self._recent.append((latency, status))
+            self._adjust(latency, status)
+            self._cond.notify_all()
+            while self._async_waiters:
+                fut = self._async_waiters.popleft()
+                if not fut.done():
+                    fut.get_loop().call_soon_threadsafe(_wake, fut)
+                    break
+
+    def abandon(self):
+        """결과 없이 슬롯만 반납 (헤지에서 진 요청, 마감으로 취소된 요청). 조정에는 반영 안 함."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+            while self._async_waiters:
+                fut = self._async_waiters.popleft()
+                if not fut.done():
+                    fut.get_loop().call_soon_threadsafe(_wake, fut)
+                    break
+
+    # --- AIMD 조정 ---
+    def _adjust(self, latency, status):
+        now = time.monotonic()
+        if status == THROTTLED:
+            self._throttled_until = now + self.backoff_base * 4
+            self._decrease(now, "HTTP 429/5xx")
+            return
+
+        errors = sum(1 for _, s in self._recent if s != OK)
+        if len(self._recent) >= 10 and errors / len(self._recent) > self.error_threshold:
+            self._decrease(now, f"에러율 {errors / len(self._recent):.0%}")
+            return
+
+        if status != OK:
+            self._streak = 0
+            return
+
+        if latency > self.latency_target * 2:
+            self._decrease(now, f"지연 {latency:.2f}s")
+            return
+
+        self._streak += 1
+        if self._streak >= self.limit and self.limit < self.max_limit:
+            self._streak = 0
+            if self.p50() <= self.latency_target:
+                self._change(self.limit + 1, f"성공 {self.limit}건 연속, p50 {self.p50():.2f}s")
+
+    def _decrease(self, now, reason):
+        self._streak = 0
+        # 한 번 줄인 직후 몰려오는 실패로 연달아 깎이지 않도록 1초 쿨다운
+        if now - self._last_decrease < 1.0:
+            return
+        self._last_decrease = now
+        self._change(max(self.min_limit, self.limit // 2), reason)
+
+    def _change(self, new_limit, reason):
+        if new_limit == self.limit:
+            return
+        self.decisions.append({"time": time.time(), "from": self.limit, "to": new_limit, "reason": reason})
+        # 증가는 5 단위로만 로그에 남김 (감소는 항상)
+        if self.verbose and (new_limit < self.limit or new_limit % 5 == 0):
+            print(f"\n⚙️ [{self.name}] 동시성 {self.limit} → {new_limit} ({reason})", flush=True)
+        self.limit = new_limit
+
+    def p50(self):
+        latencies = sorted(lat for lat, s in self._recent if s == OK)
+        return latencies[len(latencies) // 2] if latencies else 0.0
+
+    # --- 재시도 대기 ---
+    def backoff(self, attempt):
+        """attempt(0부터) 번째 재시도 전에 쉴 시간. 스로틀 직후면 그만큼 더 쉰다."""
+        delay = min(self.backoff_cap, self.backoff_base * (2 ** attempt))
+        delay *= random.uniform(0.5, 1.5)
+        return max(delay, self._throttled_until - time.monotonic())
+
+    def call(self, func, *args, retries=3, **kwargs):
+        """동기 함수(pykrx 등)를 슬롯/백오프 규칙에 맞춰 호출. 마지막 실패는 그대로 raise."""
+        for attempt in range(retries):
+            self.acquire()
+            start = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                latency = time.monotonic() - start
+                self.release(latency, ERROR, type(e).__name__)
+                get_report().record_request(self.name, latency, attempt=attempt, status=ERROR)
+                if attempt == retries - 1:
+                    raise
+                time.sleep(self.backoff(attempt))
+                continue
+            latency = time.monotonic() - start
+            self.release(latency, OK)
+            get_report().record_request(self.name, latency, attempt=attempt, status=OK)
+            return result
+
+    def summary(self):
+        text = (f"[{self.name}] 최종 동시성 {self.limit}, 조정 {len(self.decisions)}회, "
+                f"성공 {self.counts[OK]} / 스로틀 {self.counts[THROTTLED]} / 에러 {self.counts[ERROR]}")
+        if self.errors:
+            text += " (" + ", ".join(f"{k} {v}" for k, v in self.errors.most_common(5)) + ")"
+        return text
+
+
+def _wake(fut):
+    if not fut.done():
+        fut.set_result(None)
+
+
+def status_of(http_status):
+    return THROTTLED if http_status == 429 or http_status >= 500 else ERROR
+
+
+_controllers = {}
+
+
+def get_controller(name, **kwargs):
+    """이름(호스트)별로 하나씩 공유되는 제어기. 처음 만들 때만 kwargs가 적용된다."""
+    if name not in _controllers:
+        _controllers[name] = RateController(name, **kwargs)
+    return _controllers[name]
+
+
+def all_controllers():
+    return list(_controllers.values())
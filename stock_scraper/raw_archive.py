@@ -0,0 +1,153 @@
+import glob
+import gzip
+import json
+import os
+import threading
+from io import StringIO
+
+import pandas as pd
+
+# ---------------------------------------------------------
+# 원본 응답 아카이브 (날짜별 압축 파일 + 오프셋 인덱스)
+# - {dir}/{date}.raw.gz  : 항목마다 독립된 gzip 멤버를 이어 붙인 파일
+# - {dir}/{date}.idx     : 항목 키 -> (offset, length) JSON Lines (뒤에 쓴 줄이 우선)
+# - 항목: listing(종목 리스트 CSV), bulk(pykrx 일괄 수급 JSON), page:{code}(frgn.naver HTML)
+# - 샤드 수집(scrape --shard i/N)은 {dir}/shard-i-of-N/ 아래에 각자 쓴다 (open_archive가 묶어서 읽음)
+# 파서가 바뀌거나 버그가 나오면 `python -m stock_scraper reprocess --date`로
+# 네트워크 없이 파싱 -> 병합 -> 저장을 다시 돌린다.
+# ---------------------------------------------------------
+DEFAULT_ARCHIVE_DIR = "raw_archive"
+PAGE_PREFIX = "page:"
+
+
+class RawArchive:
+    def __init__(self, directory, date):
+        self.directory = directory
+        self.date = date
+        self.data_path = os.path.join(directory, f"{date}.raw.gz")
+        self.index_path = os.path.join(directory, f"{date}.idx")
+        self._data = None
+        self._index_file = None
+        self._index = None
+        self._lock = threading.Lock()
+        self.entries = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    # --- 쓰기 ---
+    def put(self, key, text):
+        data = text.encode("utf-8")
+        member = gzip.compress(data, compresslevel=6)
+        with self._lock:
+            if self._data is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._data = open(self.data_path, "ab")
+                self._index_file = open(self.index_path, "a", encoding="utf-8")
+            offset = self._data.seek(0, os.SEEK_END)
+            self._data.write(member)
+            self._index_file.write(json.dumps({"key": key, "offset": offset, "length": len(member)},
+                                              ensure_ascii=False) + "\n")
+            self.entries += 1
+            self.raw_bytes += len(data)
+            self.stored_bytes += len(member)
+
+    def put_page(self, code, html):
+        self.put(PAGE_PREFIX + code, html)
+
+    def put_listing(self, df_krx):
+        self.put("listing", df_krx.to_csv(index=False))
+
+    def put_bulk(self, records):
+        self.put("bulk", json.dumps(records, ensure_ascii=False, default=int))
+
+    def close(self):
+        with self._lock:
+            if self._data is not None:
+                self._data.close()
+                self._index_file.close()
+                self._data = self._index_file = None
+
+    # --- 읽기 ---
+    def exists(self):
+        return os.path.exists(self.index_path) and os.path.exists(self.data_path)
+
+    def _load_index(self):
+        if self._index is None:
+            self._index = {}
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue  # 쓰다가 죽은 마지막 줄
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._index[entry["key"]] = (entry["offset"], entry["length"])
+        return self._index
+
+    def get(self, key):
+        """항목 텍스트. 없으면 None."""
+        entry = self._load_index().get(key)
+        if entry is None:
+            return None
+        offset, length = entry
+        with open(self.data_path, "rb") as f:
+            f.seek(offset)
+            return gzip.decompress(f.read(length)).decode("utf-8")
+
+    def page_codes(self):
+        return [key[len(PAGE_PREFIX):] for key in self._load_index() if key.startswith(PAGE_PREFIX)]
+
+    def load_listing(self):
+        text = self.get("listing")
+        if text is None:
+            return None
+        return pd.read_csv(StringIO(text), dtype={"Code": str})
+
+    def load_bulk(self):
+        text = self.get("bulk")
+        return json.loads(text) if text else []
+
+    def summary(self):
+        return {"path": self.data_path, "entries": self.entries, "raw_bytes": self.raw_bytes,
+                "stored_bytes": self.stored_bytes}
+
+
+class ArchiveSet:
+    """샤드별 하위 폴더로 나뉜 같은 날짜 아카이브 여러 개를 하나처럼 읽는다 (읽기 전용)."""
+
+    def __init__(self, directory, archives):
+        self.data_path = os.path.join(directory, "shard-*")
+        self.archives = archives
+
+    def exists(self):
+        return all(archive.exists() for archive in self.archives)
+
+    def get(self, key):
+        for archive in self.archives:
+            text = archive.get(key)
+            if text is not None:
+                return text
+        return None
+
+    def page_codes(self):
+        return [code for archive in self.archives for code in archive.page_codes()]
+
+    def load_listing(self):
+        listings = [df for df in (archive.load_listing() for archive in self.archives) if df is not None]
+        return pd.concat(listings, ignore_index=True).drop_duplicates(subset=["Code"]) if listings else None
+
+    def load_bulk(self):
+        return [record for archive in self.archives for record in archive.load_bulk()]
+
+
+def open_archive(directory, date):
+    """reprocess용: {dir}/{date}.* 가 없으면 샤드 하위 폴더({dir}/shard-i-of-N/)를 모아서 읽는다."""
+    archive = RawArchive(directory, date)
+    if archive.exists():
+        return archive
+    parts = sorted(glob.glob(os.path.join(directory, "shard-*-of-*", f"{date}.idx")))
+    if not parts:
+        return archive
+    return ArchiveSet(directory, [RawArchive(os.path.dirname(path), date) for path in parts])
@@ -0,0 +1,72 @@
+import pandas as pd
+
+from .universe_cache import PRICE_COLS
+
+# ---------------------------------------------------------
+# 병합: 종목 리스트(가격) + 수급 레코드 -> Npaystocks 형식 result_df
+# (수급 없어도 죽지 않기: 없으면 0으로 채우고 가격만)
+# scrape/merge/reprocess 5단계(job.py)와 데몬 틱에서 같이 쓴다.
+# ---------------------------------------------------------
+
+
+def to_int(series): return pd.to_numeric(series, errors='coerce').fillna(0).astype(int)
+
+
+def build_result(df_krx, supply_data, target_date_db):
+    """(result_df, df_supply). 전일거래량/거래량비율은 derived_metrics에서 채운다."""
+    df_supply = pd.DataFrame(supply_data)
+
+    if df_supply.empty:
+        print("⚠️ [알림] 오늘자 수급 데이터가 아직 없습니다. (0으로 채우고 가격만 저장합니다)")
+        # 수급 데이터프레임이 비었으면, 그냥 df_krx를 복사해서 씀
+        df_final = df_krx.copy()
+        # 수급 컬럼 0으로 강제 생성
+        df_final['외국인순매수'] = 0
+        df_final['기관순매수'] = 0
+        df_final['개인순매수'] = 0
+    else:
+        # 수급 데이터가 있으면 병합
+        df_final = pd.merge(df_krx, df_supply, on='Code', how='left')
+
+    # 컬럼명 정리
+    rename_map = {'Code': 'Symbol', 'Name': '종목명', 'Market': '구분', 'Sector': '업종명'}
+    df_final.rename(columns=rename_map, inplace=True)
+
+    # 업종명 없는 경우 처리
+    if '업종명' not in df_final.columns: df_final['업종명'] = ''
+
+    # 대체 경로(HTML/캐시)로 가격 컬럼이 없으면 0으로 저장
+    for col in PRICE_COLS:
+        if col not in df_final.columns: df_final[col] = 0
+
+    # 결측치(NaN) 0으로 채우기 (Merge 안 된 종목, 사전 필터/네거티브 캐시로 건너뛴 종목 포함)
+    cols_to_fix = ['외국인순매수', '기관순매수', '개인순매수']
+    for col in cols_to_fix:
+        if col not in df_final.columns: # 혹시 모르니 체크
+            df_final[col] = 0
+        df_final[col] = df_final[col].fillna(0).astype('int64')
+
+    # 최종 DF 생성
+    result_df = pd.DataFrame()
+    result_df['날짜'] = [target_date_db] * len(df_final)
+    result_df['Symbol'] = df_final['Symbol']
+    result_df['종목명'] = df_final['종목명']
+    result_df['구분'] = df_final['구분']
+    result_df['업종명'] = df_final['업종명'].fillna('')
+
+    result_df['시가'] = to_int(df_final['Open'])
+    result_df['고가'] = to_int(df_final['High'])
+    result_df['저가'] = to_int(df_final['Low'])
+    result_df['현재가'] = to_int(df_final['Close'])
+    result_df['전일비'] = to_int(df_final['Changes'])
+    result_df['등락률'] = df_final['ChagesRatio'].fillna(0).astype(float)
+    result_df['거래량'] = to_int(df_final['Volume'])
+    result_df['전일거래량'] = 0  # derived_metrics.add_volume_metrics에서 채움
+    result_df['시가총액'] = (df_final['Marcap'] // 100000000).fillna(0).astype(int)
+    result_df['상장주식수'] = to_int(df_final['Stocks'])
+    result_df['외국인순매수'] = df_final['외국인순매수']
+    result_df['기관순매수'] = df_final['기관순매수']
+    result_df['개인순매수'] = df_final['개인순매수']
+    result_df['신용잔고율'] = 0.0
+
+    return result_df, df_supply
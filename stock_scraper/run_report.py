@@ -0,0 +1,110 @@
+import collections
+import json
+import threading
+import time
+from datetime import datetime
+
+# ---------------------------------------------------------
+# 실행 계측 / JSON 리포트
+# - 단계별 소요 시간 (리스트 조회, 수급 수집, 병합, DB 저장 ...)
+# - 요청 지연 분포 (p50/p95/p99 + 히스토그램), 재시도 수, 다운로드 바이트
+# - 파싱 시간, 저장 행 수, rows/sec
+# 실행이 끝나면 write()로 JSON 파일을 남겨 워크플로 아티팩트로 올린다.
+# ---------------------------------------------------------
+LATENCY_BUCKETS_MS = [50, 100, 200, 500, 1000, 2000, 5000]
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+class RunReport:
+    def __init__(self):
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.meta = {}
+        self.stages = {}
+        self.counters = collections.Counter()
+        self.values = {}
+        self._latencies = collections.defaultdict(list)
+        self._parse_times = []
+        self._open = {}
+        self._lock = threading.Lock()
+
+    # --- 단계 ---
+    def start(self, stage):
+        self._open[stage] = time.perf_counter()
+
+    def end(self, stage, **info):
+        started = self._open.pop(stage, None)
+        if started is None:
+            return
+        entry = {"wall_sec": round(time.perf_counter() - started, 3)}
+        entry.update(info)
+        self.stages[stage] = entry
+
+    # --- 요청/파싱 ---
+    def record_request(self, host, latency, nbytes=0, attempt=0, status="ok"):
+        with self._lock:
+            self._latencies[host].append(latency)
+            self.counters[f"{host}.requests"] += 1
+            self.counters[f"{host}.bytes"] += nbytes
+            self.counters[f"{host}.status.{status}"] += 1
+            if attempt > 0:
+                self.counters[f"{host}.retries"] += 1
+
+    def record_parse(self, seconds):
+        with self._lock:
+            self._parse_times.append(seconds)
+
+    def incr(self, key, n=1):
+        with self._lock:
+            self.counters[key] += n
+
+    def set(self, key, value):
+        self.values[key] = value
+
+    # --- 출력 ---
+    def latency_summary(self, host):
+        values = sorted(self._latencies.get(host, []))
+        hist = collections.OrderedDict()
+        lower = 0
+        for bound in LATENCY_BUCKETS_MS:
+            hist[f"{lower}-{bound}ms"] = sum(1 for v in values if lower <= v * 1000 < bound)
+            lower = bound
+        hist[f"{lower}ms+"] = sum(1 for v in values if v * 1000 >= lower)
+        pct = {f"p{p}": (round(_percentile(values, p), 4) if values else None) for p in (50, 95, 99)}
+        return {"count": len(values), **pct, "max": round(values[-1], 4) if values else None,
+                "histogram": hist}
+
+    def to_dict(self):
+        parse = self._parse_times
+        return {
+            "started_at": self.started_at,
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "meta": self.meta,
+            "stages": self.stages,
+            "requests": {host: self.latency_summary(host) for host in self._latencies},
+            "parse": {
+                "count": len(parse),
+                "total_sec": round(sum(parse), 3),
+                "avg_ms": round(sum(parse) / len(parse) * 1000, 3) if parse else None,
+            },
+            "counters": dict(self.counters),
+            **self.values,
+        }
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2, default=str)
+        print(f"📝 실행 리포트 저장: {path}", flush=True)
+
+
+_report = RunReport()
+
+
+def get_report():
+    """프로세스 전체에서 공유하는 리포트."""
+    return _report
@@ -0,0 +1,105 @@
+import glob
+import gzip
+import json
+import os
+import re
+import zlib
+from io import StringIO
+
+import pandas as pd
+
+from . import JobFailed
+
+# ---------------------------------------------------------
+# 샤드 수집 (scrape --shard i/N) + 병합 (merge)
+# - 종목 코드의 CRC32 % N 으로 나눈다 (파이썬 hash()는 프로세스마다 달라서 쓰지 않음).
+#   같은 코드는 어느 러너/프로세스에서든 항상 같은 샤드로 간다.
+# - 각 샤드는 DB에 쓰지 않고 {dir}/{date}.shard-{i}-of-{N}.json.gz 한 파일만 남긴다
+#   (자기 몫의 종목 리스트 CSV + 수급 레코드 + 빈 페이지 종목 + 수집 통계).
+# - merge가 N개 파일을 모두 모아 result_df를 만들고 DB에는 한 번만 쓴다.
+#   네거티브 캐시도 merge가 샤드들의 빈 페이지 종목을 합쳐 한 번에 기록한다 (샤드 러너의 캐시는 버려짐).
+# 로컬: scrape --local-shards N (프로세스 N개 + 병합) / GitHub Actions: 매트릭스 + 아티팩트 (stock_job_sharded.yml)
+# ---------------------------------------------------------
+DEFAULT_SHARD_DIR = "shards"
+SHARD_FILE = re.compile(r"^(?P<date>\d{8})\.shard-(?P<i>\d+)-of-(?P<n>\d+)\.json\.gz$")
+
+
+def shard_of(code, shards):
+    return zlib.crc32(str(code).encode("utf-8")) % shards
+
+
+def select_shard(df_krx, index, shards):
+    """df_krx 중 index번 샤드에 속하는 종목만 (원래 순서 유지)."""
+    mask = df_krx['Code'].map(lambda code: shard_of(code, shards) == index)
+    return df_krx[mask.astype(bool)].reset_index(drop=True)
+
+
+def shard_label(index, shards):
+    return f"shard-{index}-of-{shards}"
+
+
+def shard_path(path, index, shards):
+    """파일 경로에 샤드 표시를 붙인다 (scrap_checkpoint.db -> scrap_checkpoint.shard-0-of-4.db)."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{shard_label(index, shards)}{ext}"
+
+
+def shard_file(directory, date, index, shards):
+    return os.path.join(directory, f"{date}.{shard_label(index, shards)}.json.gz")
+
+
+def write_shard(directory, date, index, shards, df_krx, supply_data, stats=None, empty_codes=()):
+    """샤드 결과 파일 저장 (임시 파일에 쓰고 교체, 중간에 죽어도 반쪽 파일이 남지 않음)."""
+    os.makedirs(directory, exist_ok=True)
+    path = shard_file(directory, date, index, shards)
+    payload = {
+        "date": date, "shard": index, "shards": shards,
+        "listing": df_krx.to_csv(index=False),
+        "supply": supply_data,
+        "empty": sorted(empty_codes),
+        "stats": stats or {},
+    }
+    tmp_path = path + ".tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, default=int)
+    os.replace(tmp_path, path)
+    return path
+
+
+def find_shards(directory, date):
+    """{샤드 번호: (N, 경로)}. 하위 폴더까지 찾는다 (Actions 아티팩트는 폴더째 내려받음)."""
+    found = {}
+    for path in glob.glob(os.path.join(directory, "**", f"{date}.shard-*.json.gz"), recursive=True):
+        m = SHARD_FILE.match(os.path.basename(path))
+        if m:
+            found.setdefault(int(m.group("i")), []).append((int(m.group("n")), path))
+    return found
+
+
+def load_shards(directory, date, shards=None):
+    """(df_krx, supply_data, 빈 페이지 종목, 샤드별 통계). N개가 다 모이지 않았으면 JobFailed."""
+    found = find_shards(directory, date)
+    counts = {n for entries in found.values() for n, _ in entries}
+    if shards is None:
+        if len(counts) != 1:
+            raise JobFailed(f"{date} 샤드 파일의 샤드 수가 없거나 섞여 있습니다 ({directory}, N={sorted(counts)})")
+        shards = counts.pop()
+    paths = {i: path for i, entries in found.items() for n, path in entries if n == shards}
+    missing = [i for i in range(shards) if i not in paths]
+    if missing:
+        raise JobFailed(f"{date} 샤드 {len(missing)}/{shards}개가 없습니다: {missing} ({directory})")
+
+    listings, supply_data, empty_codes, stats = [], [], set(), []
+    for i in range(shards):
+        with gzip.open(paths[i], "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+        listings.append(pd.read_csv(StringIO(payload["listing"]), dtype={"Code": str}))
+        supply_data += payload["supply"]
+        empty_codes.update(payload.get("empty", []))
+        stats.append(dict(payload["stats"], shard=i, codes=len(listings[-1]), supply=len(payload["supply"])))
+
+    df_krx = pd.concat(listings, ignore_index=True).drop_duplicates(subset=['Code'])
+    # 같은 종목이 두 샤드에 있을 수는 없지만 (해시 분할), 파일을 섞어 넣은 경우를 대비해 한 번만
+    seen = set()
+    supply_data = [r for r in supply_data if not (r['Code'] in seen or seen.add(r['Code']))]
+    return df_krx, supply_data, sorted(empty_codes), stats
@@ -0,0 +1,94 @@
+import os
+
+import pandas as pd
+
+# ---------------------------------------------------------
+# 로컬 Parquet 스냅샷 (Npaystocks 미러, 분석/대시보드용)
+# - {dir}/날짜=YYYYMMDD/part-0.parquet : 날짜별 파티션 (같은 날짜를 다시 쓰면 덮어씀)
+# - 압축 dtype: 종목명/구분/업종명은 dictionary(categorical), 가격류 int32, 거래량류 int64
+# - load_snapshots(): 날짜 범위 + 필요한 컬럼만, 메모리 맵으로 읽어 Arrow Table 그대로 반환
+#   (pandas가 필요하면 .to_pandas(), 몇 달치 이력도 원격 Turso 왕복 없이 로컬에서 스캔)
+# pyarrow가 없으면 저장만 건너뛴다.
+# ---------------------------------------------------------
+DEFAULT_SNAPSHOT_DIR = "snapshots"
+PARTITION = "날짜"
+CATEGORY_COLS = ["종목명", "구분", "업종명"]
+INT32_COLS = ["시가", "고가", "저가", "현재가", "전일비", "시가총액"]
+INT64_COLS = ["거래량", "전일거래량", "상장주식수", "외국인순매수", "기관순매수", "개인순매수"]
+FLOAT32_COLS = ["등락률", "거래량비율", "신용잔고율"]
+
+
+def compact(df):
+    """스냅샷용 dtype으로 바꾼 복사본 (날짜 컬럼은 파티션 경로로 빠짐)."""
+    out = df.drop(columns=[PARTITION, "row_hash"], errors="ignore").copy()
+    for col in CATEGORY_COLS:
+        if col in out.columns:
+            out[col] = out[col].fillna("").astype("category")
+    for cols, dtype in ((INT32_COLS, "int32"), (INT64_COLS, "int64"), (FLOAT32_COLS, "float32")):
+        for col in cols:
+            if col in out.columns:
+                out[col] = pd.to_numeric(out[col], errors="coerce").fillna(0).astype(dtype)
+    return out.reset_index(drop=True)
+
+
+def partition_path(directory, date):
+    return os.path.join(directory, f"{PARTITION}={date}", "part-0.parquet")
+
+
+def write_snapshot(df, directory, date):
+    """date 파티션에 df를 쓴다. 쓴 경로, pyarrow가 없으면 None."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("⚠️ pyarrow가 없어 Parquet 스냅샷을 건너뜁니다.", flush=True)
+        return None
+
+    path = partition_path(directory, date)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(compact(df), preserve_index=False)
+    # 날짜마다 범주 수가 달라도 스키마가 같도록 사전 인덱스 타입 고정
+    table = table.cast(pa.schema([
+        pa.field(f.name, pa.dictionary(pa.int32(), pa.string())) if f.name in CATEGORY_COLS else f
+        for f in table.schema
+    ], metadata=table.schema.metadata))
+    # 임시 파일에 쓰고 교체 (쓰다 죽어도 기존 파티션은 온전)
+    tmp_path = path + ".tmp"
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_snapshots(directory, start=None, end=None, columns=None):
+    """[start, end] 날짜(YYYYMMDD, 양끝 포함) 파티션을 Arrow Table로. 없으면 None.
+
+    필요한 파티션/컬럼만 메모리 맵으로 읽는다. columns를 주면 날짜 컬럼은 자동 포함.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    from pyarrow import fs
+
+    if not os.path.isdir(directory):
+        return None
+    dates = sorted(
+        date for date in (name.split("=", 1)[1] for name in os.listdir(directory)
+                          if name.startswith(PARTITION + "="))
+        if (start is None or date >= start) and (end is None or date <= end)
+    )
+    paths = [partition_path(directory, date) for date in dates if os.path.exists(partition_path(directory, date))]
+    if not paths:
+        return None
+
+    # 컬럼이 나중에 추가된 파티션도 있으므로 (footer만 읽어서) 스키마를 합친다
+    partition_schema = pa.schema([(PARTITION, pa.string())])
+    schema = pa.unify_schemas([pq.read_schema(path) for path in paths] + [partition_schema])
+    dataset = ds.dataset(
+        paths, schema=schema, format="parquet",
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+        partitioning=ds.partitioning(partition_schema, flavor="hive"),
+        partition_base_dir=directory,
+    )
+    if columns is not None:
+        columns = [PARTITION] + [c for c in columns if c != PARTITION]
+    return dataset.to_table(columns=columns)
@@ -0,0 +1,242 @@
+import concurrent.futures
+import time
+
+from . import rate_control
+from .hedging import Hedger, hedged_call
+from .naver_parser import parse_supply_row
+from .naver_stream import ACCEPT_ENCODING, CHUNK_SIZE, SupplyStream, charset_of
+from .naver_urls import HEADERS, NAVER_FRGN_URL
+from .run_report import get_report
+
+# ---------------------------------------------------------
+# 네이버 금융 종목별 수급 수집 (scrape 서브커맨드 3~4단계)
+# - thread 엔진: requests + ThreadPool (요청마다 naver 제어기 슬롯)
+# - async 엔진: naver_async.fetch_supply (aiohttp 커넥션 풀)
+# - 헤지(--hedge-pct), 스트리밍 조기 중단(--stream), 수집/파싱 분리(--parse-workers),
+#   원본 아카이브(--archive), 마감(--time-budget)을 여기서 엮는다.
+# ---------------------------------------------------------
+
+
+def to_record(code, row):
+    """(외국인, 기관) 순매매량 -> 수급 레코드. 개인은 둘의 합의 반대로 추정."""
+    foreign, agency = row
+    return {
+        "Code": code,
+        "외국인순매수": foreign,
+        "기관순매수": agency,
+        "개인순매수": -(foreign + agency),
+    }
+
+
+class NaverSupplyScraper:
+    def __init__(self, args, today_str, target_date, store, naver_rate, deadline=None, archive=None):
+        self.args = args
+        self.today_str = today_str
+        self.target_date = target_date
+        self.store = store
+        self.naver_rate = naver_rate
+        self.deadline = deadline
+        self.archive = archive
+        self.report = get_report()
+        # 페이지는 정상으로 받았는데 오늘 행이 없던 종목 (네거티브 캐시 기록용)
+        self.empty_codes = set()
+        # 마감 전에 끝까지 처리된 종목 (나머지는 tail로 남김)
+        self.attempted = set()
+        # 헤지 요청 (--hedge-pct, 0이면 끔). 스레드 엔진은 요청을 별도 풀에서 돌려 먼저 온 쪽을 씀
+        self.hedger = Hedger(args.hedge_pct, args.hedge_rate) if args.hedge_pct > 0 else None
+        self.hedge_pool = (concurrent.futures.ThreadPoolExecutor(max_workers=args.max_concurrency * 2)
+                           if self.hedger else None)
+        self.pipeline = None
+
+    def past_deadline(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    # --- 파싱 ---
+    def parse_supply(self, code, html):
+        # 두 번째 type2 표에서 오늘 날짜 행만 바로 찾음 (pd.read_html 대신 전용 파서)
+        parse_start = time.perf_counter()
+        row = parse_supply_row(html, self.today_str)
+        return self.supply_record(code, row, time.perf_counter() - parse_start)
+
+    def parse_stream(self, code, stream):
+        # --stream: 다운로드하면서 이미 파싱이 끝난 SupplyStream
+        if stream.parser.done:
+            self.report.incr("naver.stream_aborted")
+        self.report.incr("naver.bytes_decoded", stream.body_bytes)
+        return self.supply_record(code, stream.row(), stream.parse_sec)
+
+    def supply_record(self, code, row, parse_sec):
+        # 파이프라인 모드에서는 파서 프로세스가 돌려준 (행, 파싱 시간)으로 바로 호출됨
+        self.report.record_parse(parse_sec)
+        if row:
+            return to_record(code, row)
+        self.empty_codes.add(code)
+        return None
+
+    # --- 요청 (thread 엔진) ---
+    def archive_page(self, code, page):
+        # 스트리밍 모드는 끊은 지점까지의 본문 (오늘 행까지는 들어 있음)
+        self.archive.put_page(code, page.text() if isinstance(page, SupplyStream) else page)
+
+    def get_page(self, url, attempt, on_start=None):
+        # 요청 1회 -> (status, 본문). on_start: 슬롯을 받고 요청을 보내기 직전 호출 (헤지 타이머 시작)
+        import requests
+
+        headers = dict(HEADERS)
+        if self.args.stream: headers["Accept-Encoding"] = ACCEPT_ENCODING
+        self.naver_rate.acquire()
+        if on_start: on_start()
+        start = time.monotonic()
+        status, error, nbytes, text = rate_control.ERROR, None, 0, None
+        try:
+            res = requests.get(url, headers=headers, timeout=5, stream=self.args.stream)
+            if res.ok and self.args.stream:
+                # 압축된 그대로 받아서 직접 풀며 파싱, 오늘 행을 보면 연결을 끊음
+                stream = SupplyStream(self.today_str, charset_of(res.headers.get("Content-Type")),
+                                      res.headers.get("Content-Encoding"), keep=self.archive is not None)
+                for chunk in res.raw.stream(CHUNK_SIZE, decode_content=False):
+                    if stream.feed(chunk): break
+                res.close()
+                status, text, nbytes = rate_control.OK, stream, stream.wire_bytes
+            elif res.ok:
+                nbytes = len(res.content)
+                status, text = rate_control.OK, res.text
+            else:
+                status, error = rate_control.status_of(res.status_code), f"HTTP {res.status_code}"
+                res.close()
+        except Exception as e:
+            error = type(e).__name__
+        finally:
+            latency = time.monotonic() - start
+            self.naver_rate.release(latency, status, error)
+            self.report.record_request("naver", latency, nbytes, attempt, status)
+        if self.hedger and status == rate_control.OK:
+            self.hedger.record(latency)
+        return status, text
+
+    def fetch_html(self, code):
+        url = NAVER_FRGN_URL.format(code=code)
+
+        for attempt in range(3):
+            if self.past_deadline():
+                return None
+            if self.hedger:
+                # p95를 넘기면 같은 요청을 하나 더 (진 쪽 응답은 버림)
+                status, text = hedged_call(self.hedger, self.hedge_pool,
+                                           lambda on_start: self.get_page(url, attempt, on_start))
+            else:
+                status, text = self.get_page(url, attempt)
+
+            if status == rate_control.OK:
+                # 페이지는 받았는데 오늘 행이 없으면 재시도해도 결과가 같으므로 바로 종료
+                self.attempted.add(code)
+                if self.archive: self.archive_page(code, text)
+                return text
+            if attempt < 2:
+                time.sleep(self.naver_rate.backoff(attempt))
+
+        self.attempted.add(code)
+        return None
+
+    def scrape_one(self, code):
+        html = self.fetch_html(code)
+        if html is None:
+            return None
+        return self.parse_stream(code, html) if self.args.stream else self.parse_supply(code, html)
+
+    # --- 수집 ---
+    def start_pipeline(self, codes):
+        """수집/파싱 분리 파이프라인 (--parse-workers N). I/O 스레드가 뜨기 전에 불러야 함."""
+        if self.args.parse_workers > 0 and self.args.stream:
+            print("ℹ️ --stream은 받으면서 파싱하므로 --parse-workers 파이프라인은 쓰지 않습니다.", flush=True)
+        elif self.args.parse_workers > 0 and codes:
+            from .parse_pipeline import ParsePipeline
+            self.pipeline = ParsePipeline(self.today_str, self.supply_record, workers=self.args.parse_workers,
+                                          queue_size=self.args.parse_queue)
+            print(f"🧵 수집/파싱 분리: 파서 프로세스 {self.pipeline.workers}개, 대기 큐 {self.pipeline.queue_size}",
+                  flush=True)
+
+    def scrape(self, codes):
+        """codes의 수급 레코드 리스트 (thread: 멀티스레딩 / async: 커넥션 풀 비동기)."""
+        if not codes or self.past_deadline():
+            return []
+        args = self.args
+        if args.engine == "async":
+            from .naver_async import fetch_supply
+
+            def checkpoint_result(code, result):
+                self.attempted.add(code)
+                if result: self.store.add(self.target_date, result)
+            return fetch_supply(codes, self.parse_stream if args.stream else self.parse_supply,
+                                limiter=self.naver_rate, per_host=args.per_host,
+                                on_result=checkpoint_result, deadline=self.deadline, pipeline=self.pipeline,
+                                hedger=self.hedger, stream_date=self.today_str if args.stream else None,
+                                on_page=self.archive_page if self.archive else None)
+        results = []
+
+        def collect(result):
+            if result:
+                results.append(result)
+                self.store.add(self.target_date, result)
+
+        # 실제 동시 요청 수는 naver_rate가 조절 (스레드는 상한만큼 띄워둠)
+        # 파이프라인 모드: 스레드는 HTML만 받고, 파싱 Future가 따로 끝나면 그때 수집
+        if self.pipeline:
+            task = lambda code: self.pipeline.submit(code, self.fetch_html)
+        else:
+            task = self.scrape_one
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=args.max_concurrency)
+        pending = {executor.submit(task, code) for code in codes}
+        completed = 0
+        total = len(codes)
+        while pending:
+            timeout = max(0.0, self.deadline - time.monotonic()) if self.deadline else None
+            done, pending = concurrent.futures.wait(pending, timeout=timeout,
+                                                    return_when=concurrent.futures.FIRST_COMPLETED)
+            if not done:
+                print(f"\n⏰ 시간 예산({args.time_budget:.0f}초) 도달 → 시작 안 한 종목은 취소", flush=True)
+                break
+            for future in done:
+                result = future.result()
+                if isinstance(result, concurrent.futures.Future):
+                    pending.add(result)
+                    continue
+                collect(result)
+                completed += 1
+                if completed % 100 == 0:
+                    print(f"   👉 진행률: {completed}/{total}", end="\r")
+        # 진행 중인 요청은 다음 시도 전에 마감을 보고 스스로 끝남
+        executor.shutdown(wait=True, cancel_futures=True)
+        for future in pending:
+            if future.cancelled():
+                continue
+            result = future.result()
+            if isinstance(result, concurrent.futures.Future):
+                result = result.result()
+            collect(result)
+        return results
+
+    def finish(self):
+        """수집 뒤 정리 + 리포트 (아카이브, 스트리밍, 헤지, 파이프라인)."""
+        report = self.report
+        if self.archive:
+            self.archive.close()
+            report.set("archive", self.archive.summary())
+            print(f"🗄️ 원본 아카이브: {self.archive.entries}건, {self.archive.raw_bytes / 1024:.0f}KB → "
+                  f"{self.archive.stored_bytes / 1024:.0f}KB ({self.archive.data_path})", flush=True)
+        if self.args.stream:
+            decoded = report.counters["naver.bytes_decoded"]
+            print(f"✂️ 스트리밍 조기 중단 {report.counters['naver.stream_aborted']}건, "
+                  f"수신 {report.counters['naver.bytes'] / 1024:.0f}KB (압축 해제 {decoded / 1024:.0f}KB)",
+                  flush=True)
+        if self.hedger:
+            report.set("hedging", self.hedger.summary())
+            report.incr("naver.hedges_issued", self.hedger.issued)
+            report.incr("naver.hedges_won", self.hedger.won)
+            print(f"🪞 헤지 요청: {self.hedger.issued}건 발행 / {self.hedger.won}건 승리 "
+                  f"(전체 {self.hedger.requests}건)", flush=True)
+            self.hedge_pool.shutdown(wait=False)
+        if self.pipeline:
+            self.pipeline.close()
+            report.set("pipeline", self.pipeline.stats())
+            print(f"🧵 파이프라인 깊이: {self.pipeline.stats()}", flush=True)
@@ -0,0 +1,68 @@
+import logging
+
+import pandas as pd
+
+from .rate_control import get_controller
+
+# ---------------------------------------------------------
+# 수급 소스 레이어 (pykrx 전 종목 일괄 조회)
+# - 투자자별로 한 번씩, 총 3번의 호출로 시장 전체 순매수량을 가져온다.
+# - 여기서 빠진 종목만 네이버 종목별 크롤링으로 메운다.
+# ---------------------------------------------------------
+# 결과 컬럼 -> pykrx investor 이름
+INVESTORS = {
+    "외국인순매수": "외국인",
+    "기관순매수": "기관합계",
+    "개인순매수": "개인",
+}
+# 네이버 frgn 페이지의 '순매매량'과 단위를 맞추기 위해 거래대금이 아닌 거래량 사용
+VALUE_COL = "순매수거래량"
+
+
+def normalize_codes(values):
+    # check_merge.py에서 잡던 문제: pykrx 인덱스가 숫자(5930)로 오면 '005930'과 병합이 안 됨
+    return pd.Index(values).astype(str).str.strip().str.zfill(6)
+
+
+def fetch_bulk_supply(date):
+    """date('YYYYMMDD')의 전 종목 순매수량 DataFrame[Code, 외국인순매수, 기관순매수, 개인순매수].
+
+    조회 실패나 미발표(전부 0)면 빈 DataFrame을 돌려준다.
+    """
+    from pykrx import stock
+    logging.getLogger('pykrx').setLevel(logging.WARNING)
+
+    krx_rate = get_controller("krx")
+    columns = ["Code"] + list(INVESTORS)
+    series = {}
+    for col, investor in INVESTORS.items():
+        try:
+            df = krx_rate.call(stock.get_market_net_purchases_of_equities_by_ticker,
+                               date, date, "ALL", investor=investor)
+        except Exception as e:
+            print(f"⚠️ pykrx 일괄 조회 실패 ({investor}): {e}", flush=True)
+            return pd.DataFrame(columns=columns)
+        if df is None or df.empty or VALUE_COL not in df.columns:
+            print(f"⚠️ pykrx 일괄 조회 결과 없음 ({investor})", flush=True)
+            return pd.DataFrame(columns=columns)
+        values = pd.to_numeric(df[VALUE_COL], errors='coerce')
+        values.index = normalize_codes(df.index)
+        series[col] = values
+
+    df_bulk = pd.DataFrame(series).fillna(0).astype('int64')
+    # 장 마감 전에는 종목은 오는데 값이 전부 0 (debug_samsung.py 사례) -> 미발표로 취급
+    if not df_bulk.to_numpy().any():
+        print("⚠️ pykrx 수급 값이 전부 0입니다. (아직 미발표로 판단)", flush=True)
+        return pd.DataFrame(columns=columns)
+
+    df_bulk.index.name = "Code"
+    return df_bulk.reset_index()[columns]
+
+
+def bulk_supply_records(date, codes):
+    """codes 중 일괄 조회로 확보한 종목의 supply_data 레코드 리스트."""
+    df_bulk = fetch_bulk_supply(date)
+    if df_bulk.empty:
+        return []
+    df_bulk = df_bulk[df_bulk["Code"].isin(set(codes))]
+    return df_bulk.to_dict("records")
@@ -0,0 +1,119 @@
+import logging
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+from .supply_source import normalize_codes
+
+# ---------------------------------------------------------
+# 종목 유니버스 캐시 (코드/종목명/시장/업종 스냅샷)
+# - 하루 3번 도는 실행 중 첫 실행의 리스트를 TTL 동안 재사용하고
+#   2·3번째 실행은 가격 컬럼만 pykrx 일괄 조회(2회)로 새로 받는다.
+# - FDR/pykrx가 모두 실패하면 마지막 정상 스냅샷(last-known-good)을 사용
+# - pykrx 대체 경로도 종목명을 종목별 호출 대신 일괄 조회로 가져온다.
+# ---------------------------------------------------------
+STATIC_COLS = ["Code", "Name", "Market", "Sector", "Dept"]
+PRICE_COLS = ["Open", "High", "Low", "Close", "Changes", "ChagesRatio", "Volume", "Marcap", "Stocks"]
+MARKETS = ["KOSPI", "KOSDAQ", "KONEX"]
+
+
+class UniverseCache:
+    def __init__(self, path, ttl_hours=12.0):
+        self.path = path
+        self.ttl_hours = ttl_hours
+
+    def save(self, df_krx):
+        with sqlite3.connect(self.path) as conn:
+            df_krx.to_sql("universe", conn, if_exists="replace", index=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('fetched_at', ?)", (str(time.time()),))
+
+    def load(self):
+        """(스냅샷 DataFrame, 경과 시간(시간 단위)). 없으면 (None, None)."""
+        if not os.path.exists(self.path):
+            return None, None
+        try:
+            with sqlite3.connect(self.path) as conn:
+                df = pd.read_sql_query("SELECT * FROM universe", conn, dtype={"Code": str})
+                fetched_at = float(conn.execute("SELECT value FROM meta WHERE key = 'fetched_at'").fetchone()[0])
+        except Exception as e:
+            print(f"⚠️ 유니버스 캐시 읽기 실패: {e}", flush=True)
+            return None, None
+        return df, (time.time() - fetched_at) / 3600
+
+    def is_fresh(self, age_hours):
+        return age_hours is not None and age_hours < self.ttl_hours
+
+
+def static_part(df_krx):
+    return df_krx[[c for c in STATIC_COLS if c in df_krx.columns]].copy()
+
+
+def fetch_prices_bulk(date, krx_rate):
+    """pykrx 일괄 조회 2번으로 전 종목 가격 컬럼(FDR 이름)을 가져온다. 실패하면 빈 DataFrame."""
+    from pykrx import stock
+    logging.getLogger('pykrx').setLevel(logging.WARNING)
+
+    try:
+        ohlcv = krx_rate.call(stock.get_market_ohlcv_by_ticker, date, market="ALL")
+        cap = krx_rate.call(stock.get_market_cap_by_ticker, date, market="ALL")
+    except Exception as e:
+        print(f"⚠️ pykrx 가격 일괄 조회 실패: {e}", flush=True)
+        return pd.DataFrame(columns=["Code"] + PRICE_COLS)
+    if ohlcv is None or ohlcv.empty or cap is None or cap.empty:
+        return pd.DataFrame(columns=["Code"] + PRICE_COLS)
+
+    ohlcv.index = normalize_codes(ohlcv.index)
+    cap.index = normalize_codes(cap.index)
+    df = pd.DataFrame({
+        "Open": ohlcv["시가"],
+        "High": ohlcv["고가"],
+        "Low": ohlcv["저가"],
+        "Close": ohlcv["종가"],
+        "ChagesRatio": ohlcv["등락률"],
+        "Volume": ohlcv["거래량"],
+    })
+    df["Marcap"] = cap["시가총액"].reindex(df.index)
+    df["Stocks"] = cap["상장주식수"].reindex(df.index)
+    # 전일비는 따로 주지 않으므로 종가와 등락률로 역산
+    prev_close = df["Close"] / (1 + df["ChagesRatio"].fillna(0) / 100)
+    df["Changes"] = (df["Close"] - prev_close.round()).fillna(0)
+    df.index.name = "Code"
+    return df.reset_index()[["Code"] + PRICE_COLS]
+
+
+def refresh_prices(cached_df, prices):
+    """캐시의 정적 컬럼 + 새 가격. 캐시에 없는 신규 상장이 있으면 None(전체 재조회 필요)."""
+    if prices.empty:
+        return None
+    static = static_part(cached_df)
+    new_codes = set(prices["Code"]) - set(static["Code"])
+    if new_codes:
+        print(f"ℹ️ 캐시에 없는 종목 {len(new_codes)}개 발견 → 전체 리스트 재조회", flush=True)
+        return None
+    return static.merge(prices, on="Code", how="inner")
+
+
+def fetch_listing_pykrx(date, krx_rate):
+    """pykrx 대체 리스트: 시장별 티커 3회 + 종목명 1회 + 가격 2회, 모두 일괄 조회."""
+    from pykrx import stock
+    logging.getLogger('pykrx').setLevel(logging.WARNING)
+
+    frames = []
+    for market in MARKETS:
+        codes = krx_rate.call(stock.get_market_ticker_list, date, market=market)
+        frames.append(pd.DataFrame({"Code": normalize_codes(codes), "Market": market}))
+    df = pd.concat(frames, ignore_index=True).drop_duplicates("Code")
+
+    # get_market_ticker_name을 종목마다 부르는 대신 종목명이 포함된 일괄 조회 1회
+    change = krx_rate.call(stock.get_market_price_change_by_ticker, date, date, market="ALL")
+    names = pd.Series(change["종목명"].values, index=normalize_codes(change.index))
+    df["Name"] = df["Code"].map(names)
+    df["Sector"] = ""
+
+    prices = fetch_prices_bulk(date, krx_rate)
+    if not prices.empty:
+        df = df.merge(prices, on="Code", how="left")
+    return df.dropna(subset=["Name"])
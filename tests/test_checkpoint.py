@@ -0,0 +1,23 @@
+import sqlite3
+
+import pandas as pd
+
+from stock_scraper.checkpoint import CheckpointStore
+
+
+def test_save_result_adds_columns_missing_from_older_checkpoint(tmp_path):
+    path = str(tmp_path / "checkpoint.db")
+    # Symbol / 거래량비율이 생기기 전 버전이 만든 result 테이블
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE result (날짜 TEXT, 종목명 TEXT, 거래량 INTEGER)")
+        conn.execute("INSERT INTO result VALUES ('20260327', '삼성전자', 5000)")
+
+    store = CheckpointStore(path)
+    assert store.previous_result("20260330", ["거래량"]) == (None, None)
+    df = pd.DataFrame({"날짜": ["20260330"], "Symbol": ["005930"], "종목명": ["삼성전자"],
+                       "거래량": [6000], "거래량비율": [1.2]})
+    store.save_result("20260330", df)
+
+    pending = store.pending_result("20260330")
+    assert pending[["Symbol", "거래량", "거래량비율"]].values.tolist() == [["005930", 6000, 1.2]]
+    store.close()
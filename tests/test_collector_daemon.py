@@ -0,0 +1,99 @@
+import pandas as pd
+
+from stock_scraper import collector_daemon
+from stock_scraper.collector_daemon import IntradayCollector
+
+
+class LatePublishFetcher:
+    """publish_at번째 fetch 호출부터 오늘 행을 돌려주는 가짜 네이버 (그 전에는 빈 페이지)."""
+
+    def __init__(self, *args, publish_at=3, **kwargs):
+        self.publish_at = publish_at
+        self.calls = 0
+
+    def fetch(self, codes, parse):
+        if not codes:
+            return
+        self.calls += 1
+        for code in codes:
+            # 999로 끝나는 종목은 발표 뒤에도 행이 없음 (거래정지 등)
+            published = self.calls >= self.publish_at and not code.endswith("999")
+            parse(code, (int(code) % 7, -1) if published else None)
+
+    def close(self):
+        pass
+
+
+def make_collector(monkeypatch, codes, negative=None):
+    monkeypatch.setattr(collector_daemon, "WarmFetcher", LatePublishFetcher)
+    monkeypatch.setattr(collector_daemon, "parse_supply_row", lambda page, today_str: page)
+    collector = IntradayCollector("20260331", engine=None, store=None, naver_rate=None, krx_rate=None,
+                                  universe=None, negative=negative, probe=2, final_after=2, bulk=False)
+    listing = pd.DataFrame({"Code": codes, "Name": codes, "Marcap": range(len(codes), 0, -1)})
+    monkeypatch.setattr(collector, "load_listing", lambda: listing)
+    monkeypatch.setattr(collector, "after_close", lambda: True)
+    monkeypatch.setattr(collector, "save", lambda: None)
+    return collector
+
+
+class RecordingNegativeCache:
+    def __init__(self):
+        self.recorded = None
+
+    def known_empty(self):
+        return set()
+
+    def record(self, date, missed, found):
+        self.recorded = (date, list(missed), sorted(found))
+
+    def close(self):
+        pass
+
+
+def test_unpublished_ticks_never_finalize(monkeypatch):
+    codes = ["000010", "000020", "000030", "000040", "000999"]
+    negative = RecordingNegativeCache()
+    collector = make_collector(monkeypatch, codes, negative)
+
+    # 마감 후지만 아직 미발표: 프로브만 돌고 아무것도 확정/빈 종목 처리되지 않아야 함
+    assert collector.tick() is False
+    assert collector.tick() is False
+    assert collector.final == set() and collector.empty == set() and collector.streak == {}
+
+    # 3번째 fetch부터 발표 -> 첫 발표 틱은 streak 1, 다음 틱에 확정
+    assert collector.tick() is False
+    assert collector.final == set()
+    assert collector.tick() is True
+    assert collector.final == set(codes[:4])
+    assert collector.empty == {"000999"}
+
+    collector.close()
+    assert negative.recorded == ("20260331", ["000999"], codes[:4])
+
+
+def test_close_before_publication_records_nothing(monkeypatch):
+    negative = RecordingNegativeCache()
+    collector = make_collector(monkeypatch, ["000010", "000020", "000030"], negative)
+    for _ in range(4):
+        collector.fetcher.publish_at = 99
+        assert collector.tick() is False
+    collector.close()
+    assert negative.recorded is None
+
+
+def test_bulk_source_leaves_only_missing_codes_to_naver(monkeypatch):
+    codes = ["000010", "000020", "000030", "000040"]
+    collector = make_collector(monkeypatch, codes)
+    collector.bulk = True
+    collector.fetcher.publish_at = 1
+    bulk = {c: {"Code": c, "외국인순매수": 1, "기관순매수": 2, "개인순매수": -3} for c in codes[:3]}
+    monkeypatch.setattr(collector, "scrape_bulk", lambda todo: {c: bulk[c] for c in todo if c in bulk})
+    requested = []
+    fetch = collector.fetcher.fetch
+    monkeypatch.setattr(collector.fetcher, "fetch",
+                        lambda todo, parse: requested.append(list(todo)) or fetch(todo, parse))
+
+    collector.tick()
+    assert requested == [["000040"]]
+    assert collector.rows["000010"] == bulk["000010"]
+    assert collector.tick() is True
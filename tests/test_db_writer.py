@@ -0,0 +1,57 @@
+import pandas as pd
+from sqlalchemy import create_engine
+
+from stock_scraper.db_writer import TABLE, write_result
+
+
+def legacy_engine():
+    # Symbol 컬럼이 생기기 전에 저장된 (Symbol이 NULL인) 가격 행 2개
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f'CREATE TABLE "{TABLE}" '
+                             f'(날짜 TEXT, 종목명 TEXT, 시가 INTEGER, 현재가 INTEGER, 거래량 INTEGER)')
+        conn.exec_driver_sql(f'INSERT INTO "{TABLE}" VALUES ("20260327", "삼성전자", 100, 110, 5000), '
+                             f'("20260327", "SK하이닉스", 200, 210, 3000)')
+    return engine
+
+
+def backfill_rows():
+    return pd.DataFrame({"날짜": ["20260327"], "Symbol": ["005930"], "종목명": ["삼성전자"],
+                         "외국인순매수": [10], "기관순매수": [-4], "개인순매수": [-6]})
+
+
+def test_partial_write_merges_into_rows_without_symbol():
+    engine = legacy_engine()
+    write_result(engine, backfill_rows(), partial=True)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f'SELECT Symbol, 종목명, 현재가, 외국인순매수 FROM "{TABLE}" '
+                                    f'ORDER BY 종목명').fetchall()
+    # 삼성전자는 예전 가격 행 하나에 수급이 합쳐지고, 백필에 없는 SK하이닉스는 그대로
+    assert rows == [(None, "SK하이닉스", 210, None), ("005930", "삼성전자", 110, 10)]
+
+
+def test_partial_write_twice_keeps_one_row():
+    engine = legacy_engine()
+    write_result(engine, backfill_rows(), partial=True)
+    write_result(engine, backfill_rows().assign(외국인순매수=12), partial=True)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f'SELECT 현재가, 외국인순매수 FROM "{TABLE}" WHERE 종목명 = "삼성전자"').fetchall()
+    assert rows == [(110, 12)]
+
+
+def test_full_write_replaces_rows_without_symbol():
+    engine = legacy_engine()
+    df = backfill_rows().assign(현재가=111)
+    write_result(engine, df)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f'SELECT Symbol, 현재가 FROM "{TABLE}"').fetchall()
+    assert rows == [("005930", 111)]
+
+
+def test_diff_write_on_new_table_then_only_changed_rows():
+    engine = create_engine("sqlite://")
+    df = backfill_rows().assign(현재가=[111])
+    # 테이블이 없어도 해시 읽기(쓰기 트랜잭션 전)가 빈 결과로 처리돼야 함
+    assert write_result(engine, df, mode="diff") == 1
+    assert write_result(engine, df, mode="diff") == 0
+    assert write_result(engine, df.assign(현재가=[112]), mode="diff") == 1
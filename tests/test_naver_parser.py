@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from stock_scraper.naver_parser import FrgnTableParser, parse_supply_row, parse_supply_rows
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "naver")
+
+
+def load(name, as_bytes):
+    # 저장본은 네이버 응답 그대로 euc-kr 바이트
+    with open(os.path.join(FIXTURE_DIR, name), "rb") as f:
+        raw = f.read()
+    return raw if as_bytes else raw.decode("euc-kr")
+
+
+@pytest.fixture(params=[True, False], ids=["bytes", "str"])
+def as_bytes(request):
+    return request.param
+
+
+def test_target_date_row(as_bytes):
+    html = load("frgn_005930.html", as_bytes)
+    assert parse_supply_row(html, "2026.03.30") == (1256679, -1756735)
+    assert parse_supply_row(html, "2026.03.27") == (-981173, -1707006)
+
+
+def test_all_rows_newest_first(as_bytes):
+    rows = parse_supply_rows(load("frgn_005930.html", as_bytes))
+    assert len(rows) == 20
+    assert rows[0][0] == "2026.03.30" and rows[-1][0] == "2026.03.03"
+
+
+def test_missing_row(as_bytes):
+    # 000660 저장본은 03.27이 최신 -> 03.30 행 없음, 빈 페이지도 None
+    assert parse_supply_row(load("frgn_000660.html", as_bytes), "2026.03.30") is None
+    assert parse_supply_row(load("frgn_empty.html", as_bytes), "2026.03.30") is None
+
+
+def test_stops_at_older_date(as_bytes):
+    html = load("frgn_000660.html", as_bytes)
+    parser = FrgnTableParser("2026.03.30")
+    chunks = [html[i:i + 2048] for i in range(0, len(html), 2048)]
+    fed = 0
+    for chunk in chunks:
+        fed += 1
+        if parser.feed(chunk):
+            break
+    # 첫 행(03.27)이 목표일보다 과거라 페이지 끝까지 가지 않고 멈춤
+    assert parser.done and fed < len(chunks)
+    assert parser.close() == []